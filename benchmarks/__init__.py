@@ -0,0 +1 @@
+"""Benchmarks of lector's detection, parsing and conversion stages on synthetic data."""
@@ -0,0 +1,171 @@
+"""Deterministic generator of synthetic, messy CSV files.
+
+All randomness derives from a seed, so that the same configuration always produces byte-identical
+files, and timings of different versions of lector can be compared.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+
+PREAMBLES: dict[str, str] = {
+    "none": "",
+    "fieldless": "Report generated automatically\nExported from some system\n",
+    "brandwatch": "Query,Brand mentions\nDate range,last month\n,,\n",
+}
+"""Initial junk lines of different kinds."""
+
+DIALECTS: dict[str, dict] = {
+    "comma": {"delimiter": ","},
+    "semicolon": {"delimiter": ";"},
+    "tab": {"delimiter": "\t"},
+    "pipe": {"delimiter": "|", "quoting": csv.QUOTE_ALL},
+}
+"""Parameters for Python's csv writer."""
+
+ENCODINGS: tuple[str, ...] = ("utf-8", "utf-8-sig", "windows-1252", "utf-16")
+
+WORDS: list[str] = [
+    *["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "café", "naïve"],
+    *["Fürstin", "señor", "garçon", "élan", "smörgåsbord", "déjà", "vu", "piñata", "über"],
+]
+"""Words including non-ascii characters representable in all encodings above."""
+
+MISSING: list[str] = ["", "NA", "N/A", "null", "-"]
+
+
+@dataclass
+class Column:
+    """A named generator of (messy) string values."""
+
+    name: str
+    kind: str
+    """One of the keys of ``GENERATORS``."""
+    null_rate: float = 0.05
+    junk_rate: float = 0.0
+    """Proportion of values that are invalid for the column's kind."""
+
+
+def pick(rng: np.random.Generator, options: list[str]) -> str:
+    """Random element of a list (faster than ``rng.choice()``, which converts it to an array)."""
+    return options[rng.integers(len(options))]
+
+
+def gen_int(rng: np.random.Generator, i: int) -> str:
+    return str(rng.integers(-1000, 100_001))
+
+
+def gen_float(rng: np.random.Generator, i: int) -> str:
+    return f"{rng.uniform(-1e4, 1e4):.3f}"
+
+
+def gen_float_comma(rng: np.random.Generator, i: int) -> str:
+    return f"{rng.uniform(0, 1e7):,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def gen_bool(rng: np.random.Generator, i: int) -> str:
+    return pick(rng, ["true", "false", "True", "False"])
+
+
+def gen_date_iso(rng: np.random.Generator, i: int) -> str:
+    dt = datetime(2020, 1, 1) + timedelta(seconds=int(rng.integers(0, 3 * 365 * 86_400 + 1)))
+    return dt.isoformat()
+
+
+def gen_date_custom(rng: np.random.Generator, i: int) -> str:
+    dt = datetime(2020, 1, 1) + timedelta(days=int(rng.integers(0, 3 * 365 + 1)))
+    return dt.strftime("%d/%m/%Y")
+
+
+def gen_list(rng: np.random.Generator, i: int) -> str:
+    return "[" + ", ".join(str(rng.integers(0, 101)) for _ in range(rng.integers(0, 6))) + "]"
+
+
+def gen_list_str(rng: np.random.Generator, i: int) -> str:
+    return "[" + ", ".join(f"'{pick(rng, WORDS)}'" for _ in range(rng.integers(1, 5))) + "]"
+
+
+def gen_category(rng: np.random.Generator, i: int) -> str:
+    return pick(rng, ["red", "green", "blue", "yellow", "black", "white"])
+
+
+def gen_text(rng: np.random.Generator, i: int) -> str:
+    text = " ".join(pick(rng, WORDS) for _ in range(rng.integers(5, 31)))
+    # Sprinkle delimiters, quotes and line breaks that need quoting
+    return text.replace("fox", 'fox, "the" fox;').replace("dog", "dog\n") + f" {i}"
+
+
+def gen_url(rng: np.random.Generator, i: int) -> str:
+    return f"https://www.example{rng.integers(0, 51)}.com/path/{pick(rng, WORDS)}?id={i}"
+
+
+GENERATORS = {
+    "int": gen_int,
+    "float": gen_float,
+    "float_comma": gen_float_comma,
+    "bool": gen_bool,
+    "date_iso": gen_date_iso,
+    "date_custom": gen_date_custom,
+    "list": gen_list,
+    "list_str": gen_list_str,
+    "category": gen_category,
+    "text": gen_text,
+    "url": gen_url,
+}
+
+DEFAULT_COLUMNS: list[Column] = [
+    Column("id", "int", null_rate=0.0),
+    Column("amount", "float", junk_rate=0.01),
+    Column("amount_eu", "float_comma"),
+    Column("flag", "bool", null_rate=0.0),
+    Column("created", "date_iso"),
+    Column("birthday", "date_custom", junk_rate=0.01),
+    Column("numbers", "list"),
+    Column("tags", "list_str"),
+    Column("color", "category"),
+    Column("comment", "text", null_rate=0.2),
+    Column("website", "url"),
+]
+
+
+def column_values(column: Column, n_rows: int, seed: int = 0) -> list[str]:
+    """Generate n_rows string values of the given column, deterministically given the seed."""
+    rng = np.random.default_rng([seed, zlib.crc32(column.name.encode("utf-8"))])
+    gen = GENERATORS[column.kind]
+    values = []
+    for i in range(n_rows):
+        r = rng.random()
+        if r < column.null_rate:
+            values.append(pick(rng, MISSING))
+        elif r < column.null_rate + column.junk_rate:
+            values.append(pick(rng, ["abc", "#REF!", "?", "1..2", "n.a."]))
+        else:
+            values.append(gen(rng, i))
+
+    return values
+
+
+def make_csv(
+    n_rows: int = 10_000,
+    columns: list[Column] | None = None,
+    dialect: str = "comma",
+    preamble: str = "none",
+    encoding: str = "utf-8",
+    seed: int = 0,
+) -> bytes:
+    """Generate an encoded CSV file with given dialect and preamble."""
+    columns = columns or DEFAULT_COLUMNS
+    data = [column_values(col, n_rows, seed) for col in columns]
+
+    buffer = io.StringIO()
+    buffer.write(PREAMBLES[preamble])
+    writer = csv.writer(buffer, lineterminator="\n", **DIALECTS[dialect])
+    writer.writerow([col.name for col in columns])
+    writer.writerows(zip(*data))
+
+    return buffer.getvalue().encode(encoding)
@@ -0,0 +1,211 @@
+"""Time lector's stages and converters in isolation on synthetic data.
+
+Usage::
+
+    python -m benchmarks.run --out results.json
+    python -m benchmarks.run --baseline results.json --tolerance 0.2
+
+Results are written as json. When a baseline is given, a comparison is printed and the exit code
+is non-zero if any benchmark got slower than the baseline by more than the tolerance.
+"""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import platform
+import statistics
+import sys
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import pyarrow as pa
+import typer
+from rich.table import Table as RichTable
+
+import lector
+from lector import ArrowReader, Autocast, Format
+from lector.csv import Chardet, Dialect, FastSniffer, Preambles, PySniffer
+from lector.csv.dialects import CLEVER_CSV
+from lector.log import CONSOLE, LOG
+from lector.types import Boolean, Category, List, Number, Text, Timestamp, Url
+
+from .data import DEFAULT_COLUMNS, DIALECTS, ENCODINGS, PREAMBLES, make_csv
+
+if CLEVER_CSV:
+    from lector.csv.dialects import CleverCSV
+
+Benchmark = tuple[str, Callable[[Any], Any], Callable[[], Any]]
+"""Name, function to time, and setup creating the function's (fresh) argument."""
+
+CONVERTERS = {
+    "number": (Number, ["id", "amount", "amount_eu"]),
+    "boolean": (Boolean, ["flag"]),
+    "timestamp": (Timestamp, ["created", "birthday"]),
+    "list": (List, ["numbers", "tags"]),
+    "text": (Text, ["comment"]),
+    "url": (Url, ["website"]),
+    "category": (Category, ["color"]),
+}
+"""Converters and the columns they should accept. All are also timed rejecting another column."""
+
+REJECT_COLUMN = "comment"
+
+CLI = typer.Typer()
+
+
+def measure(func: Callable, setup: Callable, repeat: int) -> dict[str, float]:
+    """Time repeated calls of func, each with a fresh argument created by setup."""
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        start = perf_counter()
+        func(arg)
+        times.append(perf_counter() - start)
+
+    return {"min": min(times), "median": statistics.median(times), "repeat": repeat}
+
+
+def text_buffer(data: bytes) -> io.TextIOWrapper:
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", newline="")
+
+
+def stage_benchmarks(n_rows: int, seed: int) -> Iterator[Benchmark]:
+    """Encoding, preamble and dialect detection, as well as parsing and autocasting."""
+    for encoding in ENCODINGS:
+        data = make_csv(n_rows, encoding=encoding, seed=seed)
+        yield f"encoding/chardet/{encoding}", Chardet().detect, lambda d=data: io.BytesIO(d)
+
+    for name in PREAMBLES:
+        data = make_csv(n_rows, preamble=name, seed=seed)
+        detect = lambda buffer: Preambles.detect(buffer, log=False)
+        yield f"preamble/{name}", detect, lambda d=data: text_buffer(d)
+
+    detectors = {"fastsniffer": FastSniffer(), "pysniffer": PySniffer()}
+    if CLEVER_CSV:
+        detectors["clevercsv"] = CleverCSV()
+
+    for dialect in DIALECTS:
+        data = make_csv(n_rows, dialect=dialect, seed=seed)
+        for name, detector in detectors.items():
+            yield f"dialect/{name}/{dialect}", detector.detect, lambda d=data: text_buffer(d)
+
+        delimiter = DIALECTS[dialect]["delimiter"]
+        format = Format(encoding="utf-8", preamble=0, dialect=Dialect(delimiter=delimiter))
+
+        def parse(buffer, format=format):
+            return ArrowReader(buffer, format=format, log=False).read(types="string")
+
+        yield f"parse/{dialect}", parse, lambda d=data: io.BytesIO(d)
+
+    data = make_csv(n_rows, preamble="fieldless", encoding="windows-1252", seed=seed)
+    setup = lambda: io.BytesIO(data)
+    yield "read_csv/detect+parse", lambda buffer: lector.read_csv(buffer, types="string"), setup
+    yield "read_csv/full", lector.read_csv, setup
+
+    table = lector.read_csv(io.BytesIO(make_csv(n_rows, seed=seed)), types="string")
+    yield "autocast", Autocast().cast, lambda: table
+    yield "autocast/unique", Autocast(max_unique=0.1).cast, lambda: table
+
+
+def converter_benchmarks(n_rows: int, seed: int) -> Iterator[Benchmark]:
+    """Each converter on the columns it should accept, and on one it should reject."""
+    table = lector.read_csv(io.BytesIO(make_csv(n_rows, seed=seed)), types="string")
+
+    for name, (cls, columns) in CONVERTERS.items():
+        converter = cls(threshold=0.9)
+        for column in [*columns, REJECT_COLUMN]:
+            if column == REJECT_COLUMN and name == "text":
+                continue
+
+            array = table.column(column)
+            outcome = "reject" if column == REJECT_COLUMN else "accept"
+            yield f"converter/{name}/{outcome}/{column}", converter.convert, lambda a=array: a
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_ms: float = 1.0) -> list[str]:
+    """Print comparison with baseline and return names of benchmarks that regressed.
+
+    Benchmarks faster than min_ms milliseconds are too noisy to count as regressions.
+    """
+    view = RichTable("Benchmark", "Baseline (ms)", "Current (ms)", "Ratio", title="Comparison")
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        before, after = baseline[name]["min"], result["min"]
+        ratio = after / before if before > 0 else float("inf")
+        style = ""
+        if ratio > 1 + tolerance and after * 1e3 >= min_ms:
+            regressions.append(name)
+            style = "red"
+        elif ratio < 1 - tolerance:
+            style = "green"
+
+        view.add_row(name, f"{before * 1e3:.2f}", f"{after * 1e3:.2f}", f"{ratio:.2f}", style=style)
+
+    CONSOLE.print(view)
+    return regressions
+
+
+@CLI.command()
+def run(
+    out: Path | None = typer.Option(None, help="Write results to this json file."),
+    baseline: Path | None = typer.Option(None, help="Compare with results in this json file."),
+    n_rows: int = typer.Option(10_000),
+    repeat: int = typer.Option(5),
+    seed: int = typer.Option(0),
+    tolerance: float = typer.Option(0.2, help="Allowed relative slowdown compared to baseline."),
+    min_ms: float = typer.Option(1.0, help="Ignore slowdowns of benchmarks faster than this."),
+    filter: str | None = typer.Option(None, help="Only run benchmarks containing this."),
+    log: bool = typer.Option(False, help="Show lector's own log messages."),
+):
+    """Run all benchmarks, reporting the minimum and median time of repeated runs."""
+    if not log:
+        LOG.setLevel(logging.CRITICAL)
+
+    results = {}
+    benchmarks = [*stage_benchmarks(n_rows, seed), *converter_benchmarks(n_rows, seed)]
+
+    for name, func, setup in benchmarks:
+        if filter and filter not in name:
+            continue
+
+        results[name] = measure(func, setup, repeat)
+        CONSOLE.print(f"{name:<45} {results[name]['min'] * 1e3:>10.2f} ms")
+
+    report = {
+        "meta": {
+            "lector": lector.__version__,
+            "pyarrow": pa.__version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "n_rows": n_rows,
+            "repeat": repeat,
+            "seed": seed,
+            "columns": [col.name for col in DEFAULT_COLUMNS],
+        },
+        "results": results,
+    }
+
+    if out is not None:
+        out.write_text(json.dumps(report, indent=2))
+
+    if baseline is not None:
+        previous = json.loads(baseline.read_text())
+        for key in ("n_rows", "seed"):
+            if previous["meta"][key] != report["meta"][key]:
+                CONSOLE.print(f"Warning: baseline was run with different {key}!", style="yellow")
+
+        regressions = compare(results, previous["results"], tolerance, min_ms)
+        if regressions:
+            CONSOLE.print(f"{len(regressions)} benchmarks regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    CLI()
@@ -3,14 +3,25 @@
 from __future__ import annotations
 
 from enum import Enum
+from pathlib import Path
 
 from . import utils
-from .csv import ArrowReader, Dialect, EmptyFileError, Format, Preambles
+from .csv import (
+    ArrowReader,
+    Dialect,
+    EmptyFileError,
+    Format,
+    FormatCache,
+    InvalidRows,
+    Preambles,
+)
 from .csv.abc import FileLike, PreambleRegistry
 from .csv.dialects import DialectDetector
 from .csv.encodings import EncodingDetector
 from .log import CONSOLE, LOG, schema_view, table_view
-from .types import Autocast, Cast, Converter, Registry
+from .many import ManyResult, read_many
+from .profiling import Profile
+from .types import Autocast, Cast, CastPlan, Converter, Registry
 from .types.cast import CastStrategy
 
 
@@ -20,6 +31,14 @@ class Inference(str, Enum):
     Disable = "Disable"
 
 
+def use_profile(strategy: CastStrategy | Cast, profile: Profile | None) -> CastStrategy | Cast:
+    """Let a cast strategy record its conversions into the profile (if it supports it)."""
+    if profile is not None and getattr(strategy, "profile", False) is None:
+        strategy.profile = profile
+
+    return strategy
+
+
 def read_csv(
     fp: FileLike,
     encoding: str | EncodingDetector | None = None,
@@ -28,43 +47,113 @@ def read_csv(
     types: str | dict | Inference = Inference.Auto,
     strategy: CastStrategy | None = None,
     to_pandas: bool = False,
+    stream: bool = False,
+    block_size: int | None = None,
+    columns: list[str | int] | None = None,
+    nrows: int | None = None,
+    memory_map: bool = False,
+    format: Format | None = None,
+    cache: FormatCache | None = None,
+    invalid_rows: InvalidRows | str = InvalidRows.Skip,
+    quarantine: str | Path | None = None,
+    profile: bool = False,
     log: bool = False,
 ):
-    """Thin wrapper around class-based reader interface."""
-
-    reader = ArrowReader(fp, encoding=encoding, dialect=dialect, preamble=preamble, log=log)
+    """Thin wrapper around class-based reader interface.
+
+    If ``stream`` is True, returns an iterator of record batches of approx. ``block_size`` bytes
+    each rather than a table. With automatic type inference, the types are inferred from the first
+    batch and applied to all subsequent batches.
+
+    Besides paths and buffers, ``fp`` may be in-memory ``bytes`` (or any other object supporting
+    the buffer protocol, including Arrow buffers), which are read without copying. Local files
+    can optionally be memory-mapped using ``memory_map=True``.
+
+    A previously detected ``format`` (e.g. stored using ``Format.to_json()``) can be passed
+    to skip detection, or detected formats can be cached on disk using a ``FormatCache``.
+
+    Only the ``columns`` selected by (cleaned) name or index are parsed and converted. If ``nrows``
+    is given, only that many rows are parsed (and converted), e.g. for quick previews.
+
+    Rows with the wrong number of fields are skipped by default. With
+    ``invalid_rows="quarantine"`` they are collected (and written to the ``quarantine`` file, if
+    given) instead of being logged one by one, while ``invalid_rows="pad"`` also pads or
+    truncates them to the right length and appends them to the result.
+
+    If ``profile`` is True, returns a tuple of the result and a ``Profile`` recording the time
+    and bytes used by each detection step, the parse, and each attempted type conversion.
+    """
+    prof = Profile() if profile else None
+
+    reader = ArrowReader(
+        fp,
+        encoding=encoding,
+        dialect=dialect,
+        preamble=preamble,
+        memory_map=memory_map,
+        format=format,
+        cache=cache,
+        invalid_rows=invalid_rows,
+        quarantine=quarantine,
+        profile=prof,
+        log=log,
+    )
 
     dtypes = types
     if isinstance(types, Inference):
         dtypes = None if types == Inference.Native else "string"
 
-    tbl = reader.read(types=dtypes)
+    if stream:
+        if to_pandas:
+            raise ValueError("Cannot convert to pandas when streaming record batches!")
+
+        batches = reader.iter_batches(
+            types=dtypes, block_size=block_size, columns=columns, nrows=nrows
+        )
+
+        if types == Inference.Auto:
+            strategy = use_profile(strategy or Autocast(log=log), prof)
+            batches = strategy.cast_batches(batches)
+
+        return (batches, prof) if profile else batches
+
+    if nrows is not None:
+        tbl = reader.head(nrows, types=dtypes, block_size=block_size, columns=columns)
+    else:
+        tbl = reader.read(types=dtypes, columns=columns)
 
     if types == Inference.Auto:
-        strategy = strategy or Autocast(log=log)
+        strategy = use_profile(strategy or Autocast(log=log), prof)
         tbl = strategy.cast(tbl)
 
     if to_pandas:
-        if utils.PANDAS_INSTALLED:
-            return utils.to_pandas(tbl)
+        if not utils.PANDAS_INSTALLED:
+            raise Exception("It seems pandas isn't installed in this environment!")
 
-        raise Exception("It seems pandas isn't installed in this environment!")
+        tbl = utils.to_pandas(tbl, split_blocks=True, self_destruct=True)
 
-    return tbl
+    return (tbl, prof) if profile else tbl
 
 
 __all__ = [
     "Autocast",
     "ArrowReader",
     "Cast",
+    "CastPlan",
     "CONSOLE",
     "Converter",
     "EmptyFileError",
     "Dialect",
     "Format",
+    "FormatCache",
+    "InvalidRows",
     "LOG",
+    "ManyResult",
+    "Profile",
     "Preambles",
     "Registry",
+    "read_csv",
+    "read_many",
     "schema_view",
     "table_view",
 ]
@@ -4,9 +4,10 @@ from typing import Optional
 
 import typer
 
-from . import Inference, read_csv
+from . import Inference, InvalidRows, read_csv
 from .log import LOG, pformat, schema_view, table_view
 from .utils import Timer
+from .writers import OutputFormat, write_batches
 
 CLI = typer.Typer()
 
@@ -17,12 +18,74 @@ def read(
         ..., exists=True, file_okay=True, dir_okay=False, resolve_path=True
     ),
     types: Optional[Inference] = typer.Option(Inference.Auto),
+    invalid_rows: InvalidRows = typer.Option(InvalidRows.Skip),
+    quarantine: Optional[Path] = typer.Option(None, help="Write invalid rows to this file."),
+    profile: bool = typer.Option(False, help="Show time and bytes used by each step."),
     log: Optional[bool] = typer.Option(False),
 ):
     """Read a CSV file into an Arrow table."""
     with Timer() as t:
-        tbl = read_csv(fp, types=types, log=log)
+        result = read_csv(
+            fp,
+            types=types,
+            invalid_rows=invalid_rows,
+            quarantine=quarantine,
+            profile=profile,
+            log=log,
+        )
+
+    tbl, prof = result if profile else (result, None)
 
     LOG.info(pformat(table_view(tbl, title="Final table")))
     LOG.info(pformat(schema_view(tbl.schema, title="Schema")))
+    if prof is not None:
+        LOG.info(pformat(prof))
     LOG.info(f"Import took {t.elapsed:.2f} seconds.")
+
+
+@CLI.command()
+def convert(
+    fp: Path = typer.Argument(  # noqa: B008
+        ..., exists=True, file_okay=True, dir_okay=False, resolve_path=True
+    ),
+    out: Path = typer.Argument(..., dir_okay=False, resolve_path=True),  # noqa: B008
+    format: Optional[OutputFormat] = typer.Option(None, help="Inferred from extension if None."),
+    types: Optional[Inference] = typer.Option(Inference.Auto),
+    block_size: int = typer.Option(16 << 20, help="Approx. size of batches read in bytes."),
+    row_group_size: int = typer.Option(1 << 20, help="Max. rows per Parquet row group."),
+    compression: Optional[str] = typer.Option("zstd"),
+    dictionaries: bool = typer.Option(True, help="Keep categorical columns dictionary-encoded."),
+    log: Optional[bool] = typer.Option(False),
+):
+    """Convert a CSV file to Parquet or Arrow IPC (Feather) in batches, keeping inferred types."""
+    with Timer() as t:
+        batches = read_csv(fp, types=types, stream=True, block_size=block_size, log=log)
+        n_rows = write_batches(
+            batches,
+            out,
+            format=format,
+            row_group_size=row_group_size,
+            compression=compression,
+            dictionaries=dictionaries,
+        )
+
+    LOG.info(f"Converted {n_rows} rows to '{out}' in {t.elapsed:.2f} seconds.")
+
+
+@CLI.command()
+def head(
+    fp: Path = typer.Argument(  # noqa: B008
+        ..., exists=True, file_okay=True, dir_okay=False, resolve_path=True
+    ),
+    nrows: int = typer.Option(10, "--nrows", "-n", help="Number of rows to read."),
+    types: Optional[Inference] = typer.Option(Inference.Auto),
+    block_size: int = typer.Option(1 << 20, help="Approx. size of batches read in bytes."),
+    log: Optional[bool] = typer.Option(False),
+):
+    """Preview the first rows of a CSV file, parsing and converting only as much as needed."""
+    with Timer() as t:
+        tbl = read_csv(fp, types=types, nrows=nrows, block_size=block_size, log=log)
+
+    LOG.info(pformat(table_view(tbl, title=f"First {tbl.num_rows} rows")))
+    LOG.info(pformat(schema_view(tbl.schema, title="Schema")))
+    LOG.info(f"Preview took {t.elapsed:.2f} seconds.")
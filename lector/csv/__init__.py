@@ -3,8 +3,9 @@
 Helps deteting encoding, preambles (initial junk to skip), CSV dialects etc.
 """
 from .abc import EmptyFileError, Format, Reader
-from .arrow import ArrowReader
-from .dialects import Dialect, PySniffer
+from .arrow import ArrowReader, InvalidRows
+from .cache import FormatCache
+from .dialects import Dialect, FastSniffer, PySniffer
 from .encodings import Chardet
 from .preambles import Preambles
 
@@ -13,7 +14,10 @@ __all__ = [
     "Chardet",
     "Dialect",
     "EmptyFileError",
+    "FastSniffer",
     "Format",
+    "FormatCache",
+    "InvalidRows",
     "Preambles",
     "PySniffer",
     "Reader",
@@ -2,23 +2,29 @@
 from __future__ import annotations
 
 import io
+import json
 from abc import ABC, abstractmethod
-from contextlib import suppress
-from csv import DictReader
-from dataclasses import dataclass, field
+from csv import reader as csv_reader
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import IO, Any, TextIO, Union
+from typing import IO, TYPE_CHECKING, Any, TextIO, Union
 
+import pyarrow as pa
 from rich.table import Table as RichTable
 
 from ..log import LOG, dict_view, pformat
-from ..utils import reset_buffer
-from . import dialects, encodings
+from ..profiling import Profile, record
+from . import compression, dialects, encodings
 from .dialects import Dialect, DialectDetector
 from .encodings import EncodingDetector
 from .preambles import Preambles
+from .sample import SAMPLE_BYTES, Sample, Source
 
-FileLike = Union[str, Path, IO]
+if TYPE_CHECKING:
+    from .cache import FormatCache
+
+FileLike = Union[str, Path, IO, bytes, bytearray, memoryview, pa.Buffer, pa.NativeFile]
+"""Paths, binary or text buffers, in-memory bytes or native Arrow streams."""
 
 PreambleRegistry = type(Preambles)
 
@@ -27,12 +33,30 @@ class EmptyFileError(Exception):
     """Raised when a binary file read() returns 0 bytes."""
 
 
-def is_empty(buffer: IO) -> bool:
-    """Check if a binary or text buffer is empty (from current position onwards)."""
-    pos = buffer.tell()
-    empty = len(buffer.read(1)) == 0
-    buffer.seek(pos)
-    return empty
+def open_source(fp: FileLike, memory_map: bool = False) -> FileLike:
+    """Wrap in-memory bytes as native Arrow buffers, and optionally memory-map local files.
+
+    Neither involves copying any data. Other inputs are returned unchanged.
+    """
+    if isinstance(fp, pa.Buffer):
+        return pa.BufferReader(fp)
+
+    if isinstance(fp, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(pa.py_buffer(fp))
+
+    if memory_map and isinstance(fp, (str, Path)):
+        return pa.memory_map(str(fp), "r")
+
+    return fp
+
+
+def binary_position(buffer: IO) -> int | None:
+    """Position in bytes of a binary buffer, or of a text buffer's underlying binary buffer."""
+    buffer = getattr(buffer, "buffer", buffer)
+    try:
+        return buffer.tell()
+    except Exception:
+        return None
 
 
 class CleanTextBuffer(io.TextIOWrapper):
@@ -61,6 +85,24 @@ class Format:
             width=120,
         )
 
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> Format:
+        d = d.copy()
+        if isinstance(d.get("dialect"), dict):
+            d["dialect"] = Dialect(**d["dialect"])
+
+        return cls(**d)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, s: str) -> Format:
+        return cls.from_dict(json.loads(s))
+
 
 class Reader(ABC):
     """Base class for CSV readers."""
@@ -71,16 +113,62 @@ class Reader(ABC):
         encoding: str | EncodingDetector | None = None,
         dialect: dict | Dialect | DialectDetector | None = None,
         preamble: int | PreambleRegistry | None = None,
+        memory_map: bool = False,
+        format: Format | None = None,
+        cache: FormatCache | None = None,
+        profile: Profile | None = None,
         log: bool = True,
     ) -> None:
         self.fp = fp
         self.encoding = encoding or encodings.Chardet()
-        self.dialect = dialect or dialects.CleverCSV()
+        self.dialect = dialect or dialects.FastSniffer()
         self.preamble = preamble if preamble is not None else Preambles
+        self.memory_map = memory_map
+        self.cache = cache
+        self.known_columns = None
+        self.compression = None
+        self.profile = profile
         self.log = log
+        self.shared = False
+
+        if format is not None:
+            self.use_format(format)
+
+    def use_format(self, format: Format) -> None:
+        """Skip detection of all parameters not explicitly configured, using a known format."""
+        if isinstance(self.encoding, EncodingDetector):
+            self.encoding = format.encoding
+        if isinstance(self.dialect, DialectDetector):
+            self.dialect = format.dialect
+        if isinstance(self.preamble, type):
+            self.preamble = format.preamble
+
+        self.known_columns = format.columns
+
+    def share_analysis(self, other: Reader) -> None:
+        """Re-use another reader's analysis, source and buffer, without reading them again.
+
+        The buffer remains owned by the other reader, so this reader won't close it.
+        """
+        shared = ("source", "compression", "sample", "buffer", "format", "columns")
+        for attr in (*shared, "encoding", "preamble", "dialect"):
+            setattr(self, attr, getattr(other, attr))
+        if self.compression is not None:
+            self.source_start = other.source_start
+
+        self.shared = True
+
+    def close(self) -> None:
+        """Close the text buffer, unless it's shared with another reader."""
+        if not self.shared:
+            self.buffer.close()
 
     def decode(self, fp: FileLike) -> TextIO:
-        """Make sure we have a text buffer."""
+        """Make sure we have a text buffer, and read the head sample used for detection.
+
+        The sample is read once, without moving the buffer's position, and (once the
+        encoding is known) decoded and cleaned once, for all detectors to share.
+        """
         buffer = fp
 
         if isinstance(buffer, (str, Path)):
@@ -89,21 +177,30 @@ class Reader(ABC):
             else:
                 buffer = open(buffer, "rb")  # noqa: SIM115
 
-        if is_empty(buffer):
+        self.sample = Sample.read(buffer, SAMPLE_BYTES)
+        if self.sample.empty:
             raise EmptyFileError(f"The passed object ({buffer}) contained 0 bytes of data.")
 
-        if isinstance(buffer, io.BufferedIOBase):
+        if isinstance(buffer, (io.BufferedIOBase, pa.NativeFile)):
             if isinstance(self.encoding, EncodingDetector):
-                with reset_buffer(buffer):
-                    self.encoding = self.encoding.detect(buffer)
+                with record(self.profile, "encoding"):
+                    self.encoding = self.encoding.detect(self.sample)
 
+            self.sample = self.sample.decode(self.encoding)
             buffer = CleanTextBuffer(buffer, encoding=self.encoding, errors="replace")
         else:
             self.encoding = buffer.encoding or "UTF-8"
 
         return buffer
 
-    def detect_preamble(self, buffer: TextIO) -> int:
+    def decompressed(self) -> pa.NativeFile:
+        """Fresh decompressing stream over the whole (compressed) source."""
+        if not isinstance(self.source, (str, Path)):
+            self.source.seek(self.source_start)
+
+        return compression.open_stream(self.source, self.compression)
+
+    def detect_preamble(self, buffer: Source) -> int:
         """Detect the number of junk lines at the start of the file."""
         if self.preamble is None:
             return 0
@@ -114,7 +211,7 @@ class Reader(ABC):
 
         return 0
 
-    def detect_dialect(self, buffer: TextIO) -> dict:
+    def detect_dialect(self, buffer: Source) -> dict:
         """Detect separator, quote character etc."""
         if isinstance(self.dialect, DialectDetector):
             return self.dialect.detect(buffer)
@@ -125,30 +222,51 @@ class Reader(ABC):
         return self.dialect
 
     @classmethod
-    def detect_columns(cls, buffer: TextIO, dialect: Dialect) -> list[str]:
-        """Extract column names from buffer pointing at header row."""
-        reader = DictReader(buffer, dialect=dialect.to_builtin())
-        with suppress(StopIteration):
-            _ = next(reader)
-
-        return reader.fieldnames
+    def detect_columns(cls, buffer: Source, dialect: Dialect) -> list[str] | None:
+        """Extract column names from the header row at the start of a sample (or buffer)."""
+        lines = buffer.lines if isinstance(buffer, Sample) else buffer
+        return next(csv_reader(lines, dialect=dialect.to_builtin()), None)
 
     def analyze(self):
-        """Infer all parameters required for reading a csv file."""
-        self.buffer = self.decode(self.fp)
-        cursor = self.buffer.tell()
+        """Infer all parameters required for reading a csv file.
+
+        The (binary) source is shared between detection and parsing, so in-memory and
+        memory-mapped inputs are never read more than once into Python. All detectors share a
+        single, immutable ``Sample`` of at most ``SAMPLE_BYTES`` from the head of the source.
+
+        Compressed sources (gzip, bz2, xz, zstd) are detected from their magic bytes. Detection
+        then only decompresses a head window, while ``self.buffer`` is replaced with a text
+        stream decompressing the whole file on the fly.
+
+        Readers sharing another reader's analysis (see ``share_analysis()``) skip it.
+        """
+        if self.shared:
+            return
+
+        self.source = open_source(self.fp, memory_map=self.memory_map)
+        self.compression = compression.detect(self.source)
+        if self.compression is not None and not isinstance(self.source, (str, Path)):
+            self.source_start = self.source.tell()
+
+        key = self.use_cached_format()
+
+        with record(self.profile, "decode") as span:
+            self.buffer = self.decode_head()
+            span.bytes = len(self.sample.data)
 
-        with reset_buffer(self.buffer):
-            self.preamble = self.detect_preamble(self.buffer)
+        with record(self.profile, "preamble"):
+            self.preamble = self.detect_preamble(self.sample)
 
-        for _ in range(self.preamble):
-            self.buffer.readline()
+        sample = self.sample.skip(self.preamble)
 
-        with reset_buffer(self.buffer):
-            self.dialect = self.detect_dialect(self.buffer)
+        with record(self.profile, "dialect"):
+            self.dialect = self.detect_dialect(sample)
 
-        with reset_buffer(self.buffer):
-            self.columns = self.detect_columns(self.buffer, self.dialect)
+        if self.known_columns:
+            self.columns = self.known_columns
+        else:
+            with record(self.profile, "columns"):
+                self.columns = self.detect_columns(sample, self.dialect)
 
         self.format = Format(
             encoding=self.encoding,
@@ -157,10 +275,42 @@ class Reader(ABC):
             columns=self.columns,
         )
 
+        if key is not None:
+            self.cache.put(key, self.format)
+
         if self.log:
             LOG.info(pformat(self.format))
 
-        self.buffer.seek(cursor)
+        if self.compression is not None:
+            self.buffer.close()
+            self.buffer = CleanTextBuffer(
+                self.decompressed(), encoding=self.encoding, errors="replace"
+            )
+
+    def use_cached_format(self) -> str | None:
+        """Use the source's cached format if available, else return the key to cache it under."""
+        if self.cache is None:
+            return None
+
+        key = self.cache.fingerprint(self.fp if isinstance(self.fp, (str, Path)) else self.source)
+        if key is None or (cached := self.cache.get(key)) is None:
+            return key
+
+        if self.log:
+            LOG.info("Found CSV format in cache.")
+        self.use_format(cached)
+        return None
+
+    def decode_head(self) -> TextIO:
+        """Text buffer over the source, decompressing only the head sample if compressed."""
+        if self.compression is None:
+            return self.decode(self.source)
+
+        if self.log:
+            LOG.info(f"Decompressing {self.compression} input.")
+        # One byte more than the sample, which can then tell if it is complete
+        head = compression.head(self.source, self.compression, SAMPLE_BYTES + 1)
+        return self.decode(pa.BufferReader(head))
 
     @abstractmethod
     def parse(self, *args, **kwds) -> Any:
@@ -170,7 +320,7 @@ class Reader(ABC):
         try:
             self.analyze()
             result = self.parse(*args, **kwds)
-            self.buffer.close()
+            self.close()
             return result
         except Exception:
             raise
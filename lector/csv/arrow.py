@@ -1,26 +1,49 @@
 from __future__ import annotations
 
 import codecs
+import csv
 from codecs import StreamRecoder
-from collections.abc import Iterable
-from io import SEEK_CUR, BufferedIOBase, TextIOBase
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from enum import Enum
+from io import SEEK_CUR, BufferedIOBase, BufferedReader, BytesIO, StringIO, TextIOBase
 from pathlib import Path
 from typing import Union
 
 import pyarrow as pa
+import pyarrow.compute as pac
 import pyarrow.csv as pacsv
-from pyarrow import DataType
+import pyarrow.parquet as pq
+import pyarrow.types as pat
+from pyarrow import DataType, feather
 from pyarrow.csv import InvalidRow
 
 from ..log import LOG
+from ..profiling import record
 from ..utils import MISSING_STRINGS, ensure_type, uniquify
-from .abc import EmptyFileError, FileLike, Format, Reader
+from .abc import EmptyFileError, FileLike, Format, Reader, binary_position
 
 TypeDict = dict[str, Union[str, DataType]]
 
 MAX_MSG_LEN = 200  # characters
 SKIPPED_MSG_N_MAX = 20
 
+UTF8_CODECS = ("utf-8", "utf-8-sig", "ascii")
+"""Python codec names Arrow can read without prior transcoding."""
+
+
+class InvalidRows(str, Enum):
+    """How to handle rows having a different number of fields than the header."""
+
+    Skip = "skip"
+    """Skip rows, logging the first few."""
+    Quarantine = "quarantine"
+    """Skip rows, collecting them into a table (see ``ArrowReader.quarantined()``)."""
+    Pad = "pad"
+    """Pad short rows with nulls and truncate long ones. Repaired rows are appended at the end."""
+    Error = "error"
+    """Raise on the first invalid row. The only mode not calling into Python for each row."""
+
 
 def clean_column_names(names: list[str]) -> list[str]:
     """Handle empty and duplicate column names."""
@@ -34,6 +57,23 @@ def clean_column_names(names: list[str]) -> list[str]:
     return uniquify(names)
 
 
+def select_columns(columns: Iterable[str | int], names: list[str]) -> list[str]:
+    """Resolve column names or (positional) indices against a list of (clean) column names."""
+    selected = []
+    for col in columns:
+        name = col
+        if isinstance(col, int):
+            if not -len(names) <= col < len(names):
+                raise ValueError(f"Column index {col} out of range for {len(names)} columns!")
+            name = names[col]
+        elif col not in names:
+            raise ValueError(f"Column '{col}' not found in CSV columns: {names}")
+
+        selected.append(name)
+
+    return selected
+
+
 def transcode(
     fp: FileLike,
     codec_in: str = "utf-8",
@@ -56,14 +96,236 @@ def transcode(
         fp.seek(0, SEEK_CUR)
         fp = fp.buffer
 
+    elif isinstance(fp, pa.NativeFile):
+        # The recoder proxies unknown attributes to its stream, and Arrow would bypass the recoder
+        # if it found the native file's read_buffer() method
+        fp = BufferedReader(fp)
+
     if not isinstance(fp, BufferedIOBase):
         raise ValueError(f"Have unsupported input: {type(fp)}")
 
     return codecs.EncodedFile(fp, data_encoding=codec_out, file_encoding=codec_in, errors=errors)
 
 
+def is_utf8(encoding: str | None) -> bool:
+    """Whether bytes in the given encoding can be passed to Arrow without transcoding.
+
+    Arrow itself skips the utf-8 BOM, and ascii is a subset of utf-8.
+    """
+    if not encoding:
+        return False
+
+    try:
+        return codecs.lookup(encoding).name in UTF8_CODECS
+    except LookupError:
+        return False
+
+
+def is_invalid_utf8(exc: Exception) -> bool:
+    """Whether Arrow failed because of invalid utf-8 data."""
+    return isinstance(exc, UnicodeDecodeError) or "invalid utf8" in str(exc).lower()
+
+
+def inferred_binary(schema: pa.Schema, co: pacsv.ConvertOptions) -> bool:
+    """Whether Arrow inferred a binary column, which it does for invalid utf-8 (without raising)."""
+    explicit = co.column_types or {}
+    return any(
+        (pat.is_binary(field.type) or pat.is_large_binary(field.type))
+        and field.name not in explicit
+        for field in schema
+    )
+
+
+def native_stream(fp: FileLike) -> pa.NativeFile:
+    """Wrap the input in a native Arrow stream without transcoding.
+
+    This allows Arrow to read the input without ever passing through Python (and the GIL).
+    In-memory buffers are wrapped without copying, and local files are re-opened natively
+    (such re-opened files are owned, and have to be closed, by the caller).
+    """
+    if isinstance(fp, (str, Path)):
+        return pa.OSFile(str(fp), mode="r")
+
+    if isinstance(fp, (pa.BufferReader, pa.MemoryMappedFile)):
+        # Independent reader sharing the same memory
+        pos = fp.tell()
+        buffer = fp.read_buffer()
+        fp.seek(pos)
+        return pa.BufferReader(buffer)
+
+    if isinstance(fp, pa.NativeFile):
+        return fp
+
+    if isinstance(fp, TextIOBase):
+        # See transcode() above
+        fp.seek(0, SEEK_CUR)
+        fp = fp.buffer
+
+    if isinstance(fp, BytesIO):
+        return pa.BufferReader(pa.py_buffer(fp.getvalue()).slice(fp.tell()))
+
+    name = getattr(fp, "name", None)
+    if isinstance(fp, BufferedReader) and isinstance(name, str) and Path(name).is_file():
+        stream = pa.OSFile(name, mode="r")
+        stream.seek(fp.tell())
+        return stream
+
+    if isinstance(fp, BufferedIOBase):
+        return pa.PythonFile(fp, mode="r")
+
+    raise ValueError(f"Have unsupported input: {type(fp)}")
+
+
+def limit_rows(batches: Iterable[pa.RecordBatch], n_rows: int) -> Iterator[pa.RecordBatch]:
+    """The first n_rows rows of a stream of batches, without reading any further batches."""
+    remaining = n_rows
+    for batch in batches:
+        if remaining <= 0:
+            return
+
+        sliced = batch.slice(0, remaining)
+        remaining -= sliced.num_rows
+        yield sliced
+
+        if remaining <= 0:
+            return
+
+
+def read_table(
+    fp: pa.NativeFile | StreamRecoder,
+    ro: pacsv.ReadOptions,
+    po: pacsv.ParseOptions,
+    co: pacsv.ConvertOptions,
+) -> tuple[pa.Table, int | None]:
+    """Parse the whole input, also returning the number of bytes read (if known)."""
+    start = binary_position(fp)
+    tbl = pacsv.read_csv(fp, read_options=ro, parse_options=po, convert_options=co)
+    end = binary_position(fp) if start is not None else None
+    return tbl, (end - start if end is not None else None)
+
+
+def write_table(tbl: pa.Table, path: str | Path) -> None:
+    """Write a table to a CSV, Parquet or Feather file, depending on the file extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        pq.write_table(tbl, str(path))
+    elif suffix in (".feather", ".arrow", ".ipc"):
+        feather.write_feather(tbl, str(path))
+    else:
+        pacsv.write_csv(tbl, str(path))
+
+
 class ArrowReader(Reader):
-    """Use base class detection methods to configure a pyarrow.csv.read_csv() call."""
+    """Use base class detection methods to configure a pyarrow.csv.read_csv() call.
+
+    Invalid rows (with the wrong number of fields) are handled according to ``invalid_rows``.
+    In quarantine and pad modes, they are also written to the ``quarantine`` file, if given.
+    """
+
+    def __init__(
+        self,
+        fp: FileLike,
+        *args,
+        invalid_rows: InvalidRows | str = InvalidRows.Skip,
+        quarantine: str | Path | None = None,
+        **kwds,
+    ) -> None:
+        super().__init__(fp, *args, **kwds)
+        self.invalid_rows = InvalidRows(invalid_rows)
+        self.quarantine = quarantine
+        self.invalid: list[InvalidRow] = []
+        self.n_skipped = 0
+        self.n_rows = 0
+
+    @property
+    def skip_rate(self) -> float:
+        """Proportion of invalid rows (skipped, quarantined or repaired) in the last parse."""
+        n_total = self.n_rows + self.n_skipped
+        return self.n_skipped / n_total if n_total else 0.0
+
+    def reset_invalid(self) -> None:
+        self.invalid = []
+        self.n_skipped = 0
+        self.n_rows = 0
+
+    def quarantine_row(self, row: InvalidRow) -> str:
+        """Collect row without further processing, since Arrow holds the GIL while calling."""
+        self.invalid.append(row)
+        return "skip"
+
+    def quarantined(self) -> pa.Table:
+        """Invalid rows collected during the last parse, with text truncated to MAX_MSG_LEN."""
+        rows = list(zip(*self.invalid)) or [[], [], [], []]
+        expected, actual, number, text = rows
+        return pa.table(
+            {
+                "number": pa.array(number, pa.int64()),
+                "expected_columns": pa.array(expected, pa.int32()),
+                "actual_columns": pa.array(actual, pa.int32()),
+                "text": pac.utf8_slice_codeunits(pa.array(text, pa.string()), 0, MAX_MSG_LEN),
+            }
+        )
+
+    def repair_invalid(self, schema: pa.Schema, co: pacsv.ConvertOptions) -> pa.Table | None:
+        """In pad mode, pad or truncate collected invalid rows and parse them like valid ones."""
+        if self.invalid_rows != InvalidRows.Pad or not self.invalid:
+            return None
+
+        n_fields = self.invalid[0].expected_columns
+        dialect = self.format.dialect.to_builtin()
+        lines = StringIO("\n".join(row.text for row in self.invalid))
+        rows = [(fields + [""] * n_fields)[:n_fields] for fields in csv.reader(lines, dialect)]
+
+        buffer = StringIO()
+        csv.writer(buffer, dialect).writerows(rows)
+
+        names = list(clean_column_names(self.columns))
+        if len(names) != n_fields:
+            names = [f"f{i}" for i in range(n_fields)]
+
+        ro = pacsv.ReadOptions(column_names=names)
+        po = pacsv.ParseOptions(
+            delimiter=dialect.delimiter,
+            quote_char=dialect.quotechar or False,
+            double_quote=dialect.doublequote,
+            escape_char=dialect.escapechar or False,
+            newlines_in_values=True,
+        )
+        co = pacsv.ConvertOptions(
+            column_types={field.name: field.type for field in schema},
+            include_columns=schema.names,
+            null_values=co.null_values,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True,
+        )
+
+        try:
+            data = pa.BufferReader(buffer.getvalue().encode("utf-8"))
+            tbl = pacsv.read_csv(data, read_options=ro, parse_options=po, convert_options=co)
+            return tbl.rename_columns(schema.names).cast(schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+            LOG.error(f"Could not repair invalid rows, skipping them instead: {exc}")
+            return None
+
+    def report_invalid(self) -> None:
+        """Log and store the rows skipped in the last parse."""
+        if self.invalid_rows in (InvalidRows.Quarantine, InvalidRows.Pad):
+            self.n_skipped = len(self.invalid)
+
+            if self.quarantine is not None:
+                write_table(self.quarantined(), self.quarantine)
+
+        if self.n_skipped > 0:
+            LOG.warning(f"Found {self.n_skipped} invalid rows ({self.skip_rate:.2%} of all rows).")
+
+    def invalid_row_handler(self):
+        if self.invalid_rows == InvalidRows.Error:
+            return None
+
+        if self.invalid_rows == InvalidRows.Skip:
+            return self.skip_invalid_row
+
+        return self.quarantine_row
 
     def skip_invalid_row(self, row: InvalidRow) -> str:
         self.n_skipped += 1
@@ -91,7 +353,7 @@ class ArrowReader(Reader):
                 "double_quote": format.dialect.double_quote,
                 "escape_char": format.dialect.escape_char,
                 "newlines_in_values": True,
-                "invalid_row_handler": self.skip_invalid_row,
+                "invalid_row_handler": self.invalid_row_handler(),
             },
             "convert_options": {
                 "check_utf8": False,
@@ -100,24 +362,34 @@ class ArrowReader(Reader):
             },
         }
 
-    def parse(  # noqa: PLR0912
+    def options(
         self,
         types: str | TypeDict | None = None,
         timestamp_formats: str | list[str] | None = None,
         null_values: str | Iterable[str] | None = None,
-    ) -> pa.Table:
-        """Invoke Arrow's parser with inferred CSV format."""
-        self.n_skipped = 0
+        columns: Iterable[str | int] | None = None,
+    ) -> tuple[pacsv.ReadOptions, pacsv.ParseOptions, pacsv.ConvertOptions]:
+        """Create Arrow's CSV options from inferred CSV format and explicit arguments.
 
+        If ``columns`` are selected, by (cleaned) name or index, the clean names are passed to
+        Arrow directly (skipping the header row), so that Arrow only converts those columns.
+        """
         config = self.configure(self.format)
 
         ro = config["read_options"]
         po = config["parse_options"]
         co = config["convert_options"]
 
+        names = self.columns
+        if columns is not None:
+            names = list(clean_column_names(self.columns))
+            ro["column_names"] = names
+            ro["skip_rows_after_names"] = 1
+            co["include_columns"] = select_columns(columns, names)
+
         if types is not None:
             if isinstance(types, (str, DataType)):
-                types = {col: ensure_type(types) for col in self.columns}
+                types = {col: ensure_type(types) for col in names}
             elif isinstance(types, dict):
                 types = {col: ensure_type(type) for col, type in types.items()}
 
@@ -139,22 +411,174 @@ class ArrowReader(Reader):
         else:
             co["null_values"] = MISSING_STRINGS
 
+        # Arrow always receives utf-8, either natively or transcoded (see input())
+        ro["encoding"] = "utf-8"
+
+        return (
+            pacsv.ReadOptions(**ro),
+            pacsv.ParseOptions(**po),
+            pacsv.ConvertOptions(**co),
+        )
+
+    def input(self, native: bool = True) -> pa.NativeFile | StreamRecoder:
+        """Byte stream for Arrow to read from, transcoded to utf-8 only if necessary.
+
+        Compressed sources are decompressed while streaming.
+        """
+        source = self.source
+        if self.compression is not None:
+            source = self.decompressed()
+
+        if native:
+            return native_stream(source)
+
+        return transcode(source, codec_in=self.encoding, codec_out="utf-8")
+
+    @contextmanager
+    def opened(self, native: bool = True) -> Iterator[pa.NativeFile | StreamRecoder]:
+        """Input for a single read, closing local files re-opened natively afterwards."""
+        fp = self.input(native)
         try:
-            fp = transcode(self.fp, codec_in=self.encoding, codec_out="utf-8")
-            ro["encoding"] = "utf-8"
+            yield fp
+        finally:
+            if isinstance(fp, pa.OSFile) and fp is not self.source:
+                fp.close()
 
-            tbl = pacsv.read_csv(
-                fp,
-                read_options=pa.csv.ReadOptions(**ro),
-                parse_options=pa.csv.ParseOptions(**po),
-                convert_options=pa.csv.ConvertOptions(**co),
-            )
+    def parse(
+        self,
+        types: str | TypeDict | None = None,
+        timestamp_formats: str | list[str] | None = None,
+        null_values: str | Iterable[str] | None = None,
+        columns: Iterable[str | int] | None = None,
+    ) -> pa.Table:
+        """Invoke Arrow's parser with inferred CSV format."""
+        self.reset_invalid()
+
+        ro, po, co = self.options(types, timestamp_formats, null_values, columns)
+        native = is_utf8(self.encoding)
+        co.check_utf8 = native
+
+        try:
+            with record(self.profile, "parse") as span:
+                try:
+                    with self.opened(native) as fp:
+                        tbl, n_bytes = read_table(fp, ro, po, co)
+                    if native and inferred_binary(tbl.schema, co):
+                        tbl = None
+                except (pa.ArrowInvalid, UnicodeDecodeError) as exc:
+                    if not (native and is_invalid_utf8(exc)):
+                        raise
+
+                    tbl = None
+
+                if tbl is None:
+                    LOG.warning("Found invalid utf-8, will transcode replacing invalid bytes.")
+                    self.reset_invalid()
+                    co.check_utf8 = False
+                    with self.opened(native=False) as fp:
+                        tbl, n_bytes = read_table(fp, ro, po, co)
+
+                if n_bytes is not None:
+                    span.bytes = n_bytes
+                span.meta.update(rows=tbl.num_rows, native=co.check_utf8)
 
             column_names = list(clean_column_names(tbl.column_names))
             tbl = tbl.rename_columns(column_names)
+            self.n_rows = tbl.num_rows
+
+            repaired = self.repair_invalid(tbl.schema, co)
+            if repaired is not None:
+                tbl = pa.concat_tables([tbl, repaired])
+
+            self.report_invalid()
+            span.meta.update(skipped=self.n_skipped, skip_rate=round(self.skip_rate, 6))
             return tbl
         except pa.ArrowInvalid as exc:
             if "Empty CSV file or block" in (msg := str(exc)):
                 raise EmptyFileError(msg) from None
 
             raise
+
+    def iter_batches(
+        self,
+        types: str | TypeDict | None = None,
+        timestamp_formats: str | list[str] | None = None,
+        null_values: str | Iterable[str] | None = None,
+        block_size: int | None = None,
+        columns: Iterable[str | int] | None = None,
+        nrows: int | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream the CSV as record batches of (approximately) ``block_size`` bytes each.
+
+        Like read(), but using Arrow's streaming reader, so that only a few batches need to
+        be held in memory at any one time, independent of the size of the file. Note that when
+        not specifying types explicitly, Arrow infers them from the first batch only.
+
+        If ``nrows`` is given, stops reading as soon as that many rows have been yielded. The
+        (clean) schema of the batches is available as ``self.schema`` once the stream is opened.
+        """
+        self.analyze()
+        self.reset_invalid()
+
+        ro, po, co = self.options(types, timestamp_formats, null_values, columns)
+        ro.block_size = block_size or ro.block_size
+        native = is_utf8(self.encoding)
+        co.check_utf8 = native
+
+        streams = ExitStack()
+        try:
+            try:
+                fp = streams.enter_context(self.opened(native))
+                reader = pacsv.open_csv(fp, read_options=ro, parse_options=po, convert_options=co)
+                if native and inferred_binary(reader.schema, co):
+                    reader = None
+            except (pa.ArrowInvalid, UnicodeDecodeError) as exc:
+                if "Empty CSV file or block" in (msg := str(exc)):
+                    raise EmptyFileError(msg) from None
+
+                if not (native and is_invalid_utf8(exc)):
+                    raise
+
+                reader = None
+
+            if reader is None:
+                # Can only fall back to transcoding if invalid utf-8 is found in the first batch.
+                # Later batches with invalid utf-8 will raise.
+                LOG.warning("Found invalid utf-8, will transcode replacing invalid bytes.")
+                co.check_utf8 = False
+                fp = streams.enter_context(self.opened(native=False))
+                reader = pacsv.open_csv(fp, read_options=ro, parse_options=po, convert_options=co)
+
+            names = list(clean_column_names(reader.schema.names))
+            schema = pa.schema(field.with_name(name) for field, name in zip(reader.schema, names))
+            self.schema = schema
+
+            for batch in reader if nrows is None else limit_rows(reader, nrows):
+                self.n_rows += batch.num_rows
+                yield pa.RecordBatch.from_arrays(batch.columns, schema=schema)
+
+            # Invalid rows are only complete once the whole file has been read
+            repaired = self.repair_invalid(schema, co) if nrows is None else None
+            if repaired is not None:
+                yield from repaired.to_batches()
+
+            self.report_invalid()
+        finally:
+            streams.close()
+            self.close()
+
+    def head(
+        self,
+        nrows: int,
+        types: str | TypeDict | None = None,
+        timestamp_formats: str | list[str] | None = None,
+        null_values: str | Iterable[str] | None = None,
+        block_size: int | None = None,
+        columns: Iterable[str | int] | None = None,
+    ) -> pa.Table:
+        """Read the first ``nrows`` rows only, parsing no more batches than necessary."""
+        batches = self.iter_batches(
+            types, timestamp_formats, null_values, block_size, columns, nrows=nrows
+        )
+        batches = list(batches)
+        return pa.Table.from_batches(batches, schema=self.schema)
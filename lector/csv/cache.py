@@ -0,0 +1,123 @@
+"""Persistent cache of detected CSV formats.
+
+Detecting the encoding, preamble and dialect of a CSV file can take longer than parsing it.
+If the same file is read repeatedly, its format can be cached on disk, keyed by a fingerprint
+of the file (its size, modification time and a hash of its first bytes).
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pyarrow as pa
+
+from ..log import LOG
+from .abc import FileLike, Format
+
+
+def default_cache_dir() -> Path:
+    """Default cache directory, respecting XDG_CACHE_HOME."""
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "lector" / "formats"
+
+
+def fingerprint(fp: FileLike, n_bytes: int = 1 << 16) -> str | None:
+    """Hash of a file's size, modification time (if known) and first n_bytes bytes.
+
+    Buffers are read from their current position and reset afterwards. Returns None for
+    inputs that cannot be fingerprinted, e.g. text buffers or non-seekable streams.
+    """
+    if isinstance(fp, (str, Path)):
+        stat = os.stat(fp)
+        meta = f"{stat.st_size}:{stat.st_mtime_ns}"
+        with open(fp, "rb") as file:
+            head = file.read(n_bytes)
+    elif isinstance(fp, (io.BufferedIOBase, pa.NativeFile)) and fp.seekable():
+        pos = fp.tell()
+        size = fp.seek(0, io.SEEK_END) - pos
+        fp.seek(pos)
+        head = fp.read(n_bytes)
+        fp.seek(pos)
+        meta = f"{size}"
+    else:
+        return None
+
+    digest = hashlib.blake2b(meta.encode("utf-8"), digest_size=16)
+    digest.update(head)
+    return digest.hexdigest()
+
+
+@dataclass
+class FormatCache:
+    """On-disk LRU cache mapping file fingerprints to detected formats.
+
+    Each format is stored as a small json file. Reading an entry refreshes its modification
+    time, and the least recently used entries are evicted when there are more than
+    ``max_entries``.
+    """
+
+    directory: str | Path = field(default_factory=default_cache_dir)
+    max_entries: int = 1000
+    n_bytes: int = 1 << 16  # 64 KiB
+    """Number of initial bytes to hash when fingerprinting files."""
+
+    def __post_init__(self):
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def fingerprint(self, fp: FileLike) -> str | None:
+        return fingerprint(fp, n_bytes=self.n_bytes)
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def entries(self) -> list[Path]:
+        """Cached entries, least recently used first."""
+        return sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime_ns)
+
+    def get(self, key: str) -> Format | None:
+        path = self.path(key)
+
+        try:
+            format = Format.from_json(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            LOG.warning(f"Ignoring invalid cache entry {path}: {exc}")
+            path.unlink(missing_ok=True)
+            return None
+
+        path.touch()
+        return format
+
+    def put(self, key: str, format: Format) -> None:
+        path = self.path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(format.to_json(), encoding="utf-8")
+        tmp.replace(path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries exceeding the maximum size."""
+        entries = self.entries()
+        for path in entries[: max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def invalidate(self, fp: FileLike) -> bool:
+        """Remove the cached format of a file, returning whether there was one."""
+        key = self.fingerprint(fp)
+        if key is None or not self.path(key).exists():
+            return False
+
+        self.path(key).unlink(missing_ok=True)
+        return True
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self.entries())
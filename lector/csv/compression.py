@@ -0,0 +1,100 @@
+"""Detection and transparent decompression of compressed CSV inputs.
+
+The compression is detected from magic bytes rather than file extensions, so works equally for
+paths, buffers and in-memory data. Detection of the CSV format only needs to decompress a small
+head window, while parsing decompresses the whole file in a (native) streaming fashion.
+"""
+from __future__ import annotations
+
+import lzma
+import re
+from io import TextIOBase
+from pathlib import Path
+from typing import IO, Union
+
+import pyarrow as pa
+
+Source = Union[str, Path, IO, pa.NativeFile]
+
+MAGIC: dict[str, re.Pattern] = {
+    "gzip": re.compile(rb"\x1f\x8b"),
+    "bz2": re.compile(rb"BZh[1-9]1AY&SY"),
+    "xz": re.compile(rb"\xfd7zXZ\x00"),
+    "zstd": re.compile(rb"\x28\xb5\x2f\xfd"),
+}
+"""Signatures at the start of compressed streams (bz2 including its block header)."""
+
+N_MAGIC = 10
+HEAD_BYTES = 1 << 22
+"""Size of the decompressed head window used for detection of the CSV format (4 MiB)."""
+
+
+def read_prefix(fp: Source, n_bytes: int) -> bytes:
+    """Read up to n_bytes from the current position of a binary source, without consuming them."""
+    if isinstance(fp, (str, Path)):
+        with open(fp, "rb") as f:
+            return f.read(n_bytes)
+
+    pos = fp.tell()
+    data = fp.read(n_bytes)
+    fp.seek(pos)
+    return bytes(data)
+
+
+def detect(fp: Source) -> str | None:
+    """Name of the compression used by the source, if any, as identified by its magic bytes."""
+    if isinstance(fp, TextIOBase):
+        return None
+
+    try:
+        magic = read_prefix(fp, N_MAGIC)
+    except Exception:
+        return None
+
+    for name, pattern in MAGIC.items():
+        if pattern.match(magic):
+            return name
+
+    return None
+
+
+def open_stream(fp: Source, compression: str) -> pa.NativeFile:
+    """Decompressing stream over the source, starting at its current position.
+
+    Arrow's native codecs are used where available, so that the stream can be parsed without
+    passing through Python. Arrow doesn't support xz, which is decompressed using Python's lzma.
+    """
+    if compression == "xz":
+        fp = str(fp) if isinstance(fp, Path) else fp
+        return pa.PythonFile(lzma.open(fp, "rb"), mode="r")
+
+    return pa.input_stream(str(fp) if isinstance(fp, Path) else fp, compression=compression)
+
+
+def read_partial(stream: pa.NativeFile, n_bytes: int, chunk_size: int = 1 << 16) -> bytes:
+    """Read up to n_bytes from a stream over truncated data, keeping whatever could be read."""
+    chunks, size = [], 0
+    try:
+        while size < n_bytes and (chunk := stream.read(chunk_size)):
+            chunks.append(chunk)
+            size += len(chunk)
+    except (OSError, EOFError, pa.ArrowInvalid):
+        pass
+
+    return b"".join(chunks)
+
+
+def head(fp: Source, compression: str, n_bytes: int = HEAD_BYTES) -> bytes:
+    """Decompress the first n_bytes of a compressed source, reading as little of it as possible.
+
+    Compressed prefixes of growing size are tried, since block-based codecs (bz2) produce no
+    output at all until a whole block has been read. The source's position is left unchanged.
+    """
+    n_compressed = 1 << 16
+    while True:
+        prefix = read_prefix(fp, n_compressed)
+        data = read_partial(open_stream(pa.BufferReader(prefix), compression), n_bytes)
+        if len(data) >= n_bytes or len(prefix) < n_compressed:
+            return data[:n_bytes]
+
+        n_compressed *= 4
@@ -16,16 +16,20 @@ Python quoting levels:
 """
 from __future__ import annotations
 
+import re
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from contextlib import suppress
 from csv import QUOTE_MINIMAL, QUOTE_NONE, Sniffer, get_dialect
 from csv import Dialect as PyDialect
 from dataclasses import dataclass
-from itertools import islice
-from typing import TextIO
+from io import StringIO
+from time import perf_counter
+
+import numpy as np
 
 from ..log import LOG
+from .sample import Source, head_lines, read_text, rewound
 
 try:
     import clevercsv as ccsv
@@ -42,6 +46,9 @@ N_ROWS_DFAULT: int = 100
 DELIMITER_OPTIONS: tuple[str] = (",", ";", "\t", "|")
 """Allowed delimiters for dialect detection."""
 
+QUOTE_OPTIONS: tuple[str] = ('"', "'")
+"""Allowed quote characters for dialect detection."""
+
 
 @dataclass
 class Dialect:
@@ -113,8 +120,8 @@ class DialectDetector(ABC):
     """Base class for all dialect detectors."""
 
     @abstractmethod
-    def detect(self, buffer: TextIO) -> Dialect:
-        ...
+    def detect(self, buffer: Source) -> Dialect:
+        """Detect the dialect from a head sample (or text buffer)."""
 
 
 @dataclass
@@ -125,7 +132,7 @@ class PySniffer(DialectDetector):
     n_rows: int = N_ROWS_DFAULT
     log: bool = False
 
-    def detect(self, buffer: TextIO) -> Dialect:
+    def detect(self, buffer: Source) -> Dialect:
         """Detect a dialect we can read(!) a CSV with using the python sniffer.
 
         Note that the sniffer is not reliable for detecting quoting, quotechar etc., but reasonable
@@ -133,14 +140,12 @@ class PySniffer(DialectDetector):
         even configurable in pyarrow's csv reader, nor in pandas (python engine).
         """
 
-        pos = buffer.tell()
         sniffer = Sniffer()
         sniffer.preferred = []
 
         for n_rows in (self.n_rows, 1):
-            with suppress(Exception):
-                buffer.seek(pos)
-                sample = "\n".join(islice(buffer, n_rows))
+            with suppress(Exception), rewound(buffer):
+                sample = "\n".join(head_lines(buffer, n_rows))
                 dialect = sniffer.sniff(sample, delimiters=self.delimiters)
 
                 # To read(!) a CSV reliably, we must have either doublequote=True or an escapechar,
@@ -166,6 +171,150 @@ class PySniffer(DialectDetector):
         return Dialect()
 
 
+def field_counts(
+    sample: bytes,
+    delimiters: Iterable[str],
+    quote_char: str,
+) -> dict[str, np.ndarray]:
+    """Count delimiters outside of quotes in each complete line of the sample.
+
+    Quotes are assumed to be balanced, so that a character is quoted if preceded by an odd number
+    of quote characters (escaped quotes simply toggle twice). The last line is ignored, as it
+    may have been cut off.
+    """
+    chars = np.frombuffer(sample, dtype=np.uint8)
+    quoted = np.cumsum(chars == ord(quote_char)) % 2 == 1
+    line_ends = np.flatnonzero((chars == ord("\n")) & ~quoted)
+
+    # Exclude blank lines
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    lengths = line_ends - line_starts
+    blank = (lengths == 0) | ((lengths == 1) & (chars[line_ends - 1] == ord("\r")))
+
+    counts = {}
+    for delim in delimiters:
+        positions = np.flatnonzero((chars == ord(delim)) & ~quoted)
+        lines = np.searchsorted(line_ends, positions)
+        per_line = np.bincount(lines, minlength=len(line_ends) + 1)[: len(line_ends)]
+        counts[delim] = per_line[~blank]
+
+    return counts
+
+
+def consistency(counts: np.ndarray) -> tuple[float, int]:
+    """Share of lines having the most common (non-zero) number of delimiters, and that number."""
+    if len(counts) == 0:
+        return 0.0, 0
+
+    values, freqs = np.unique(counts, return_counts=True)
+    mode = values[np.argmax(freqs)]
+    if mode == 0:
+        return 0.0, 0
+
+    return float(freqs.max() / len(counts)), int(mode)
+
+
+@dataclass
+class FastSniffer(DialectDetector):
+    """Detect delimiter and quote char by counting fields per line, vectorized with NumPy.
+
+    For each delimiter, scores the consistency of the number of delimiters outside of quotes
+    across lines (using the first allowed quote char enclosing fields in the sample). Samples of
+    increasing size are analyzed until the best candidate is unambiguous. If the time budget is
+    exceeded, the best candidate so far is returned. If the result is still ambiguous once the
+    largest sample (or the whole input) has been analyzed, CleverCSV (if installed) is used as a
+    fallback on that sample.
+    """
+
+    delimiters: Iterable[str] = DELIMITER_OPTIONS
+    quote_chars: Iterable[str] = QUOTE_OPTIONS
+    n_chars: tuple[int, ...] = (1 << 14, 1 << 17, 1 << 20)
+    """Sizes of samples to try in order (number of characters)."""
+    min_consistency: float = 0.9
+    """Best candidate is ambiguous if fewer lines than this agree on its number of fields."""
+    margin: float = 0.1
+    """Best candidate is ambiguous if another delimiter's consistency is within this margin."""
+    max_seconds: float | None = 1.0
+    """Time budget, checked after each sample."""
+    fallback: bool = True
+    """Whether to fall back to CleverCSV (if installed) when the result is ambiguous."""
+    log: bool = False
+
+    def encloses_fields(self, sample: bytes, quote_char: str) -> bool:
+        """Whether the quote char opens a field somewhere, and closes a field after that.
+
+        I.e. it must occur right after a delimiter or line start, and (later) right before a
+        delimiter or line end. A mere apostrophe inside a field doesn't qualify.
+        """
+        quote = re.escape(quote_char.encode("utf-8"))
+        delims = b"".join(re.escape(d.encode("utf-8")) for d in self.delimiters)
+        opening = re.search(rb"(?:^|[" + delims + rb"])" + quote, sample, re.MULTILINE)
+        if opening is None:
+            return False
+
+        closing = re.compile(quote + rb"(?=[" + delims + rb"\r\n]|$)", re.MULTILINE)
+        return closing.search(sample, opening.end()) is not None
+
+    def quote_char(self, sample: bytes) -> str:
+        """The first of the allowed quote chars enclosing fields in the sample (or the first)."""
+        quote_chars = list(self.quote_chars)
+        enclosing = (q for q in quote_chars if self.encloses_fields(sample, q))
+        return next(enclosing, quote_chars[0])
+
+    def scores(self, sample: bytes) -> list[tuple[float, int, str, str]]:
+        """Candidates of (consistency, n_delimiters, delimiter, quote_char), best first."""
+        quote_char = self.quote_char(sample)
+        counts = field_counts(sample, self.delimiters, quote_char)
+        candidates = [(*consistency(c), delim, quote_char) for delim, c in counts.items()]
+
+        # Stable sort keeps the configured order of delimiters in ties
+        return sorted(candidates, key=lambda c: c[0], reverse=True)
+
+    def is_ambiguous(self, scores: list[tuple[float, int, str, str]]) -> bool:
+        best, _, delim, _ = scores[0]
+        if best < self.min_consistency:
+            return True
+
+        others = (score for score, _, d, _ in scores[1:] if d != delim)
+        return next(others, 0.0) > best - self.margin
+
+    def detect(self, buffer: Source) -> Dialect:
+        start = perf_counter()
+        text = ""
+
+        for n_chars in self.n_chars:
+            text += read_text(buffer, len(text), n_chars)
+            # Terminate the last line if we've reached the end of the buffer
+            eof = len(text) < n_chars
+            sample = (text + "\n" if eof else text).encode("utf-8")
+
+            scores = self.scores(sample)
+            best, mode, delim, quote_char = scores[0]
+            if mode == 0:
+                # Single-column file (or no complete line yet)
+                if eof:
+                    return Dialect()
+                continue
+
+            if not self.is_ambiguous(scores):
+                return Dialect(delimiter=delim, quote_char=quote_char)
+
+            if eof:
+                break
+
+            if self.max_seconds is not None and perf_counter() - start > self.max_seconds:
+                if self.log:
+                    LOG.info("Dialect detection ran out of time, using best candidate so far.")
+                return Dialect(delimiter=delim, quote_char=quote_char)
+
+        if self.fallback and CLEVER_CSV and text:
+            if self.log:
+                LOG.info("Dialect is ambiguous, falling back to CleverCSV.")
+            return CleverCSV().detect(StringIO(text))
+
+        return Dialect(delimiter=delim, quote_char=quote_char) if mode > 0 else Dialect()
+
+
 if CLEVER_CSV:
     # CleverCSV may return non-sensical characters as escapechar.
     # Monkey-patch to at least limit to ASCII chars.
@@ -190,8 +339,8 @@ if CLEVER_CSV:
         method: str = "auto"
         verbose: bool = False
 
-        def detect(self, buffer: TextIO) -> Dialect:
-            text = buffer.read(self.num_chars)
+        def detect(self, buffer: Source) -> Dialect:
+            text = read_text(buffer, 0, self.num_chars)
             dialect = ccsv.Detector().detect(
                 text,
                 delimiters=DELIMITER_OPTIONS,
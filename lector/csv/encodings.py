@@ -3,11 +3,14 @@ from __future__ import annotations
 
 import codecs
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import BinaryIO, Literal
 
 import cchardet as cdet
 
+from .sample import Sample
+
 BOMS: dict[str, tuple[Literal, ...]] = {
     "utf-8-sig": (codecs.BOM_UTF8,),
     "utf-16": (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE),
@@ -44,38 +47,93 @@ class EncodingDetector(ABC):
     """Base class specifying interface for all encoding detetors."""
 
     @abstractmethod
-    def detect(self, buffer: BinaryIO) -> str:
+    def detect(self, buffer: BinaryIO | Sample) -> str:
         """Implement me."""
 
 
 @dataclass
 class Chardet(EncodingDetector):
-    """An encoding detector using cchardet if the default utf-8 generates too many errors."""
+    """An encoding detector using cchardet if the default utf-8 generates too many errors.
+
+    The buffer is read incrementally in chunks, so that detection stops as soon as the result
+    is certain, and never holds more than a single chunk in memory.
+    """
 
     n_bytes: int = int(1e7)  # 10 MB
-    """Use this many bytes to detect encoding."""
+    """Use at most this many bytes to detect encoding."""
+    n_bytes_utf8: int = 1 << 20  # 1 MiB
+    """Validate utf-8 using at most this many bytes."""
+    chunk_size: int = 1 << 16  # 64 KiB
+    """Number of bytes to read and analyze at a time."""
     error_threshold: float = 0.001
     """A greater proportion of decoding errors than this will be considered a failed encoding."""
     confidence_threshold: float = 0.6
     """Minimum level of confidence to accept an encoding automatically detected by cchardet."""
 
-    def detect(self, buffer: BinaryIO) -> str:
+    def chunks(self, buffer: BinaryIO, n_bytes: int) -> Iterator[bytes]:
+        """Read up to n_bytes from buffer in chunks."""
+        n_read = 0
+        while n_read < n_bytes:
+            chunk = buffer.read(min(self.chunk_size, n_bytes - n_read, MAX_INT32))
+            if not chunk:
+                break
+
+            n_read += len(chunk)
+            yield chunk
+
+    def is_utf8(self, buffer: BinaryIO) -> bool:
+        """Whether the proportion of utf-8 decoding errors doesn't exceed the threshold.
+
+        Stops early if the errors exceed the budget allowed for the whole window of bytes.
+        """
+        # Multi-byte characters split across chunks (or truncated by the window) aren't errors
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        budget = self.error_threshold * self.n_bytes_utf8
+        n_chars = n_errors = 0
+
+        for chunk in self.chunks(buffer, self.n_bytes_utf8):
+            string = decoder.decode(chunk)
+            n_chars += len(string)
+            n_errors += string.count(CODEC_ERR_CHAR)
+            if n_errors > budget:
+                return False
+
+        return n_chars == 0 or n_errors / n_chars <= self.error_threshold
+
+    def chardet(self, buffer: BinaryIO) -> tuple[str | None, float]:
+        """Feed chunks to cchardet until it is confident or the maximum of bytes was read."""
+        detector = cdet.UniversalDetector()
+        for chunk in self.chunks(buffer, self.n_bytes):
+            detector.feed(chunk)
+            if detector.done:
+                break
+
+        detector.close()
+        return detector.result["encoding"], detector.result["confidence"]
+
+    def detect(self, buffer: BinaryIO | Sample) -> str:
         """Somewhat 'opinionated' encoding detection.
 
         Assumes utf-8 as most common encoding, falling back on cchardet detection, and
         if all else fails on windows-1250 if encoding is latin-like.
+
+        Given a (head) sample, at most the sample's bytes are used, independent of ``n_bytes``.
         """
-        head: bytes = buffer.read(min(self.n_bytes, MAX_INT32))
+        if isinstance(buffer, Sample):
+            buffer = buffer.binary()
+
+        start = buffer.tell()
 
-        bom_encoding = detect_bom(head)
+        bom_encoding = detect_bom(buffer.read(4))
         if bom_encoding:
             return bom_encoding
 
-        if decoding_errors(head, "utf-8", prop=True) <= self.error_threshold:
+        buffer.seek(start)
+        if self.is_utf8(buffer):
             return "utf-8"
 
-        detected = cdet.detect(head)
-        encoding, confidence = detected["encoding"], detected["confidence"]
+        buffer.seek(start)
+        encoding, confidence = self.chardet(buffer)
 
         if encoding:
             if confidence > self.confidence_threshold:
@@ -1,24 +1,134 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
 import pandas as pd
+import pyarrow as pa
 
+from ..log import LOG
 from .abc import Reader
+from .arrow import ArrowReader
+
+ARROW_KWDS = ("usecols", "nrows")
+"""Arguments of pandas.read_csv() that the Arrow engine supports (by mapping them to Arrow's)."""
+
+
+def rechunk(batches: Iterable[pa.RecordBatch], n_rows: int) -> Iterator[pa.Table]:
+    """Collect consecutive batches into tables of exactly n_rows (except the last)."""
+    tbl = None
+    for batch in batches:
+        batch_tbl = pa.Table.from_batches([batch])
+        tbl = batch_tbl if tbl is None else pa.concat_tables([tbl, batch_tbl])
+        while tbl.num_rows >= n_rows:
+            yield tbl.slice(0, n_rows)
+            tbl = tbl.slice(n_rows)
+
+    if tbl is not None and tbl.num_rows > 0:
+        yield tbl
 
 
 class PandasReader(Reader):
-    """Use base class detection methods to configure a pandas.read_csv() call."""
+    """Use base class detection methods to configure a pandas.read_csv() call.
+
+    With ``engine="pyarrow"`` (the default), the CSV is parsed by an ``ArrowReader`` using the
+    detected format, and only the result is converted to pandas. Pandas' own pyarrow engine
+    isn't used, since it doesn't support preambles or newlines in quoted values. Falls back to
+    pandas' python engine for dialects and arguments Arrow doesn't support.
+    """
+
+    def use_arrow(self, engine: str, kwds: dict) -> bool:
+        """Whether the detected dialect and pandas arguments can be handled by Arrow."""
+        if engine != "pyarrow":
+            return False
+
+        reason = None
+        if self.format.dialect.skip_initial_space:
+            reason = "dialect with skip_initial_space"
+        elif unsupported := set(kwds).difference(ARROW_KWDS):
+            reason = f"arguments {sorted(unsupported)}"
 
-    def parse(self, *args, **kwds):
-        """Invoke Pandas' parser with inferred CSV format."""
-        cfg = {
+        if reason is not None:
+            LOG.warning(f"Arrow doesn't support {reason}, falling back to python engine.")
+            return False
+
+        return True
+
+    def options(self) -> dict:
+        """Pandas' (python engine) options from the detected format."""
+        dialect = self.format.dialect
+        return {
             "encoding": self.format.encoding,
             "skiprows": self.format.preamble,
+            "sep": dialect.delimiter,
+            "quotechar": dialect.quote_char,
+            "escapechar": dialect.escape_char,
+            "doublequote": dialect.double_quote,
+            "skipinitialspace": dialect.skip_initial_space,
+            "quoting": dialect.quoting,
             "on_bad_lines": "warn",
             "engine": "python",
         }
-        cfg.update(self.format.dialect)
 
-        # Or "\n"? Pandas doesn't allow "\r\n"...
-        cfg["lineterminator"] = None
+    def arrow_reader(self) -> ArrowReader:
+        """Arrow reader sharing this reader's analysis (hence skipping detection) and buffer."""
+        reader = ArrowReader(
+            self.fp,
+            format=self.format,
+            memory_map=self.memory_map,
+            profile=self.profile,
+            log=False,
+        )
+        reader.share_analysis(self)
+        return reader
+
+    def parse(self, *args, engine: str = "pyarrow", **kwds) -> pd.DataFrame:
+        """Invoke Arrow's or pandas' parser with inferred CSV format."""
+        if self.use_arrow(engine, kwds):
+            reader = self.arrow_reader()
+            columns = kwds.get("usecols")
+            if (nrows := kwds.get("nrows")) is not None:
+                tbl = reader.head(nrows, columns=columns)
+            else:
+                tbl = reader.read(columns=columns)
+
+            return tbl.to_pandas()
+
+        return pd.read_csv(self.buffer, *args, **{**self.options(), **kwds})
+
+    def iter_chunks(
+        self,
+        chunksize: int,
+        *args,
+        engine: str = "pyarrow",
+        block_size: int | None = None,
+        **kwds,
+    ) -> Iterator[pd.DataFrame]:
+        """Read the CSV in chunks of ``chunksize`` rows each.
+
+        With the Arrow engine, the file is streamed in batches of approx. ``block_size`` bytes,
+        and types are inferred from the first batch only (as in ``ArrowReader.iter_batches()``).
+        """
+        self.analyze()
+        try:
+            if self.use_arrow(engine, kwds):
+                reader = self.arrow_reader()
+                batches = reader.iter_batches(
+                    block_size=block_size, columns=kwds.get("usecols"), nrows=kwds.get("nrows")
+                )
+                for tbl in rechunk(batches, chunksize):
+                    yield tbl.to_pandas()
+            else:
+                options = {**self.options(), **kwds, "chunksize": chunksize}
+                with pd.read_csv(self.buffer, *args, **options) as chunks:
+                    yield from chunks
+        finally:
+            self.close()
+
+    def read(self, *args, chunksize: int | None = None, **kwds) -> pd.DataFrame:
+        """Read into a single dataframe, or an iterator of dataframes if chunksize is given."""
+        if chunksize is not None:
+            return self.iter_chunks(chunksize, *args, **kwds)
+
+        return super().read(*args, **kwds)
 
-        kwds = {**cfg, **kwds}
-        result = pd.read_csv(self.buffer, *args, **kwds)
-        return result
+    __call__ = read
@@ -11,10 +11,9 @@ import csv
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from dataclasses import dataclass, field
-from itertools import islice
-from typing import TextIO
 
 from ..log import LOG
+from .sample import Source, head_lines, rewound
 
 
 @dataclass
@@ -24,8 +23,8 @@ class PreambleDetector(ABC):
     n_rows: int = 100
 
     @abstractmethod
-    def detect(self, buffer: TextIO) -> int:
-        """Detect preamble and return number of lines to skip."""
+    def detect(self, buffer: Source) -> int:
+        """Detect preamble in a head sample (or text buffer) and return number of lines to skip."""
 
 
 class Preambles:
@@ -41,7 +40,7 @@ class Preambles:
     @classmethod
     def detect(
         cls,
-        buffer: TextIO,
+        buffer: Source,
         detectors: Iterable[PreambleDetector] | None = None,
         log: bool = False,
     ) -> int:
@@ -52,14 +51,17 @@ class Preambles:
 
         If no detectors are provided (as ordered sequence), all registered
         detector classes are tried in registered order and using default parameters.
-        """
-        cursor = buffer.tell()
 
+        Given a ``Sample``, all detectors share its already decoded lines, rather than each
+        re-reading them from a buffer.
+        """
         if detectors is None:
             detectors = (det() for det in cls.DETECTORS.values())
 
         for detector in detectors:
-            skiprows = detector.detect(buffer)
+            with rewound(buffer):
+                skiprows = detector.detect(buffer)
+
             if skiprows:
                 if log:
                     name = detector.__class__.__name__
@@ -67,8 +69,6 @@ class Preambles:
                     LOG.info(msg)
                 return skiprows
 
-            buffer.seek(cursor)
-
         return 0
 
 
@@ -81,8 +81,8 @@ class Brandwatch(PreambleDetector):
     to separate preamble texts from the CSV table as such.
     """
 
-    def detect(self, buffer: TextIO) -> int:
-        rows = [row.strip() for row in islice(buffer, self.n_rows)]
+    def detect(self, buffer: Source) -> int:
+        rows = [row.strip() for row in head_lines(buffer, self.n_rows)]
 
         for i, row in enumerate(rows):
             if len(row) > 0 and all(x == "," for x in row):
@@ -104,11 +104,11 @@ class Fieldless(PreambleDetector):
 
     delimiters: str | list[str] = field(default_factory=lambda: [",", ";", "\t"])
 
-    def detect_with_delimiter(self, buffer: TextIO, delimiter: str) -> int:
+    def detect_with_delimiter(self, buffer: Source, delimiter: str) -> int:
         """Count how many consecutive initial fieldless rows we have given specific delimiter."""
 
         reader = csv.reader(
-            islice(buffer, self.n_rows),
+            head_lines(buffer, self.n_rows),
             delimiter=delimiter,
             quotechar='"',
             quoting=csv.QUOTE_MINIMAL,
@@ -122,17 +122,17 @@ class Fieldless(PreambleDetector):
 
         return 0
 
-    def detect(self, buffer: TextIO) -> int:
+    def detect(self, buffer: Source) -> int:
         """Count consecutive initial fieldless rows given the most frequent delimiter."""
 
-        cursor = buffer.tell()
         delimiters = [self.delimiters] if isinstance(self.delimiters, str) else self.delimiters
 
-        text = "".join(islice(buffer, self.n_rows))
+        with rewound(buffer):
+            text = "".join(head_lines(buffer, self.n_rows))
+
         counts = {delim: text.count(delim) for delim in delimiters}
         delimiter = max(counts.items(), key=lambda item: item[1])[0]
 
-        buffer.seek(cursor)
         return self.detect_with_delimiter(buffer, delimiter)
 
 
@@ -148,13 +148,12 @@ class GoogleAds(Fieldless):
     GoogleAds also seems to include two "totals" rows at the end, which we exclude here.
     """
 
-    def detect(self, buffer: TextIO) -> int:
-        cursor = buffer.tell()
-        skip = super().detect(buffer)
+    def detect(self, buffer: Source) -> int:
+        with rewound(buffer):
+            skip = super().detect(buffer)
 
         if skip:
-            buffer.seek(cursor)
-            rows = [row.strip() for row in islice(buffer, self.n_rows)]
+            rows = [row.strip() for row in head_lines(buffer, self.n_rows)]
 
             is_report = any("informe de" in row.lower() for row in rows[0:skip])
             has_campaign_col = any("Campaña" in col for col in rows[skip].split(","))
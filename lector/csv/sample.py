@@ -0,0 +1,131 @@
+"""An immutable head sample of a CSV source, shared by all detectors.
+
+The sample is read once from the (binary) source, then decoded and cleaned of null bytes once,
+so that the encoding, preamble, dialect and header detectors never have to read (or seek
+back and forth over) the source themselves.
+"""
+from __future__ import annotations
+
+import io
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from itertools import islice
+from typing import IO, BinaryIO, TextIO, Union
+
+from ..utils import reset_buffer
+
+SAMPLE_BYTES = 1 << 22
+"""Maximum size of the head sample used for detection of the CSV format (4 MiB)."""
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Bytes at the start of a source, and their (lazily) decoded and cleaned text."""
+
+    data: bytes
+    """Raw bytes, as read from the source."""
+    complete: bool = False
+    """Whether the sample contains the whole source (rather than being cut off)."""
+    encoding: str | None = None
+    """Encoding of the data, once known."""
+    skipped: int = 0
+    """Number of lines skipped from the start of the text (e.g. the preamble)."""
+    raw_text: str | None = field(default=None, repr=False)
+    """Text of text sources, which don't have to be decoded."""
+
+    @classmethod
+    def read(cls, buffer: IO, n_bytes: int = SAMPLE_BYTES) -> Sample:
+        """Read the sample from a binary or text buffer, leaving its position unchanged."""
+        pos = buffer.tell()
+        data = buffer.read(n_bytes)
+        complete = len(data) < n_bytes or len(buffer.read(1)) == 0
+        buffer.seek(pos)
+
+        if isinstance(data, str):
+            return cls(b"", complete=complete, encoding=buffer.encoding, raw_text=data)
+
+        return cls(bytes(data), complete=complete)
+
+    @property
+    def empty(self) -> bool:
+        """Whether the source contained no data at all."""
+        return not self.data and not self.raw_text
+
+    def binary(self) -> BinaryIO:
+        """A fresh binary buffer over the raw data (e.g. for encoding detection)."""
+        return io.BytesIO(self.data)
+
+    def decode(self, encoding: str) -> Sample:
+        """The same sample with its data to be decoded using the given encoding."""
+        return replace(self, encoding=encoding)
+
+    def skip(self, n_lines: int) -> Sample:
+        """The same sample starting n_lines further into the text."""
+        sample = replace(self, skipped=self.skipped + n_lines)
+        # Share the decoded lines (cached properties live in the instance's dict)
+        sample.__dict__["all_lines"] = self.all_lines
+        return sample
+
+    @cached_property
+    def all_lines(self) -> list[str]:
+        """All (complete) lines of the decoded text, with null bytes removed.
+
+        Newlines are translated as when reading a file in text mode. Unless the sample is
+        complete, the last line is dropped, since it may have been cut off (except if it's the
+        only line).
+        """
+        if self.raw_text is not None:
+            text = self.raw_text
+        else:
+            wrapper = io.TextIOWrapper(
+                self.binary(), encoding=self.encoding or "utf-8", errors="replace"
+            )
+            text = wrapper.read()
+
+        lines = list(io.StringIO(text.replace("\x00", "")))
+        if not self.complete and len(lines) > 1 and not lines[-1].endswith("\n"):
+            lines.pop()
+        return lines
+
+    @property
+    def lines(self) -> list[str]:
+        """Lines of the text after those skipped."""
+        return self.all_lines[self.skipped :]
+
+    @cached_property
+    def text(self) -> str:
+        """Text after the skipped lines."""
+        return "".join(self.lines)
+
+    def buffer(self) -> TextIO:
+        """A fresh text buffer over the text (for detectors requiring one)."""
+        return io.StringIO(self.text)
+
+
+Source = Union[TextIO, Sample]
+"""Detectors accept a shared sample, or (for backwards compatibility) a text buffer."""
+
+
+def head_lines(source: Source, n_rows: int) -> list[str]:
+    """The first n_rows lines of a sample or (consumed from) a text buffer."""
+    if isinstance(source, Sample):
+        return source.lines[:n_rows]
+
+    return list(islice(source, n_rows))
+
+
+def read_text(source: Source, start: int, stop: int) -> str:
+    """Characters start to stop of a sample, or the next ones (stop - start) of a text buffer."""
+    if isinstance(source, Sample):
+        return source.text[start:stop]
+
+    return source.read(stop - start)
+
+
+def rewound(source: Source) -> AbstractContextManager:
+    """Context resetting a text buffer's position (samples don't have a position)."""
+    if isinstance(source, Sample):
+        return nullcontext()
+
+    return reset_buffer(source)
@@ -0,0 +1,82 @@
+"""Read many CSV files in parallel into a single table."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pyarrow as pa
+from pyarrow import Table
+from tqdm.auto import tqdm
+
+from .log import LOG
+from .types.cast import n_workers, unify_tables
+
+UNSUPPORTED_KWDS = ("stream", "to_pandas", "profile")
+"""Arguments of ``read_csv()`` making it return something other than a single Arrow table."""
+
+
+@dataclass
+class ManyResult:
+    """Tables read successfully, and errors of files that couldn't be read, by path."""
+
+    tables: dict[str, Table] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+    table: Table | None = None
+    """All tables concatenated into one, if requested."""
+
+
+def read_file(path: str | Path, kwds: dict) -> Table:
+    """Read a single file in a worker process."""
+    from . import read_csv
+
+    return read_csv(path, **kwds)
+
+
+def read_many(
+    paths: list[str | Path],
+    n_jobs: int | None = -1,
+    concat: bool = True,
+    log: bool = False,
+    **kwds,
+) -> ManyResult:
+    """Read CSV files in a pool of processes, each file with its own format and types.
+
+    Remaining keyword arguments are passed on to ``read_csv()``. If ``concat`` is True, the tables
+    are unified to a common schema (widening numeric types, filling missing columns with nulls
+    and merging dictionaries) and concatenated. Errors, such as empty files, are collected
+    rather than aborting the whole batch.
+    """
+    unsupported = [arg for arg in UNSUPPORTED_KWDS if kwds.get(arg)]
+    if unsupported:
+        raise ValueError(f"Can only read many files into Arrow tables, got {unsupported}!")
+
+    paths = [str(path) for path in paths]
+    result = ManyResult()
+    n_workers_ = min(n_workers(n_jobs), len(paths))
+
+    def collect(path, get):
+        try:
+            result.tables[path] = get()
+        except Exception as exc:
+            LOG.warning(f"Failed to read '{path}': {exc!r}")
+            result.errors[path] = exc
+
+    if n_workers_ <= 1:
+        for path in tqdm(paths, desc="Reading", disable=not log):
+            collect(path, lambda path=path: read_file(path, kwds))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers_) as pool:
+            futures = [pool.submit(read_file, path, kwds) for path in paths]
+            progress = tqdm(zip(paths, futures), total=len(paths), desc="Reading", disable=not log)
+            for path, future in progress:
+                collect(path, future.result)
+
+    if concat and result.tables:
+        tables = unify_tables(list(result.tables.values()))
+        result.table = pa.concat_tables(tables).unify_dictionaries()
+
+    if log:
+        LOG.info(f"Read {len(result.tables)} files, failed to read {len(result.errors)}.")
+
+    return result
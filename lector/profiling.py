@@ -0,0 +1,94 @@
+"""Lightweight profiling of lector's stages (detection, parsing, conversion)."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from time import perf_counter, process_time
+
+from rich.padding import Padding
+from rich.table import Table as RichTable
+
+from .log import BOX
+
+
+@dataclass
+class Span:
+    """Resources used by a single step."""
+
+    name: str
+    wall: float = 0.0
+    """Elapsed time in seconds."""
+    cpu: float = 0.0
+    """CPU time of the whole process in seconds (includes other threads, e.g. Arrow's)."""
+    bytes: int | None = None
+    """Number of bytes read from the input, or processed by a converter, if known."""
+    meta: dict = field(default_factory=dict)
+    """E.g. the column and whether a converter accepted it."""
+
+
+@dataclass
+class Profile:
+    """Collects spans of profiled steps in the order they finished."""
+
+    spans: list[Span] = field(default_factory=list)
+
+    @contextmanager
+    def record(
+        self,
+        name: str,
+        position: Callable[[], int | None] | None = None,
+        **meta,
+    ) -> Iterator[Span]:
+        """Profile the enclosed block. Yields the span, so its bytes and meta can be updated.
+
+        If a position function is given, the number of bytes read is the difference of its
+        results before and after the block.
+        """
+        span = Span(name, meta=meta)
+        start = position() if position is not None else None
+        wall, cpu = perf_counter(), process_time()
+
+        try:
+            yield span
+        finally:
+            span.wall = perf_counter() - wall
+            span.cpu = process_time() - cpu
+            if start is not None and (end := position()) is not None:
+                span.bytes = end - start
+            self.spans.append(span)
+
+    def find(self, prefix: str) -> list[Span]:
+        return [span for span in self.spans if span.name.startswith(prefix)]
+
+    def total(self, prefix: str = "") -> float:
+        """Total wall time of spans whose name starts with prefix."""
+        return sum(span.wall for span in self.find(prefix))
+
+    def to_dict(self) -> dict:
+        return {"spans": [asdict(span) for span in self.spans]}
+
+    def __rich__(self) -> Padding:
+        rt = RichTable(title="Profile", title_justify="left", box=BOX)
+        rt.add_column("Step", style="indian_red1", no_wrap=True)
+        rt.add_column("Wall (ms)", justify="right")
+        rt.add_column("CPU (ms)", justify="right")
+        rt.add_column("Bytes", justify="right")
+        rt.add_column("Details")
+
+        for span in self.spans:
+            details = ", ".join(f"{k}={v}" for k, v in span.meta.items())
+            n_bytes = f"{span.bytes:,}" if span.bytes is not None else ""
+            rt.add_row(
+                span.name, f"{span.wall * 1e3:.2f}", f"{span.cpu * 1e3:.2f}", n_bytes, details
+            )
+
+        return Padding(rt, 1)
+
+
+def record(profile: Profile | None, name: str, **kwds):
+    """Profile a block if a profile is given, otherwise do nothing."""
+    if profile is None:
+        return nullcontext(Span(name))
+
+    return profile.record(name, **kwds)
@@ -6,7 +6,7 @@ text etc.
 """
 from .abc import Converter, Registry
 from .bools import Boolean
-from .cast import Autocast, Cast
+from .cast import Autocast, Cast, CastPlan
 from .lists import List
 from .numbers import Number
 from .strings import Category, Text, Url
@@ -18,6 +18,7 @@ __all__ = [
     "Autocast",
     "Boolean",
     "Cast",
+    "CastPlan",
     "Converter",
     "Registry",
     "Category",
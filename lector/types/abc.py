@@ -13,6 +13,10 @@ class Conversion:
 
     result: Array
     meta: dict = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    """Converter parameters resolved during conversion (e.g. an inferred format)."""
+    converter: Converter | None = None
+    """The converter that produced the result, if known (e.g. when autocasting)."""
 
 
 @dataclass
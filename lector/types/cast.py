@@ -1,19 +1,36 @@
 """Helpers to easily cast columns to their most appropriate/efficient type."""
 from __future__ import annotations
 
+import json
+import os
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
-from dataclasses import dataclass, field
-from typing import Union
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from enum import Enum
+from functools import cache, cached_property
+from itertools import islice
+from typing import Callable, TypeVar, Union
 
 import pyarrow as pa
-from pyarrow import Array, ChunkedArray, Table
+import pyarrow.compute as pac
+import pyarrow.types as pat
+from pyarrow import Array, ChunkedArray, DataType, Field, RecordBatch, Schema, Table
 from tqdm.auto import tqdm
 
-from ..log import LOG, iformat, pformat, schema_diff_view
-from ..utils import encode_metadata, schema_diff
+from ..log import LOG, iformat, pformat, schema_diff_view, schema_view
+from ..profiling import Profile, record
+from ..utils import (
+    MISSING_STRINGS,
+    decode_metadata,
+    encode_metadata,
+    is_stringy,
+    sample_valid,
+    schema_diff,
+    type_from_string,
+)
 from .abc import Conversion, Converter, Registry
-from .numbers import DecimalMode
+from .numbers import DecimalMode, Number, infer_decimal_delimiter
 from .strings import Category
 
 Config = dict[str, dict]
@@ -22,6 +39,8 @@ Config = dict[str, dict]
 Converters = Union[Config, Iterable[Converter], None]
 """Accepted argument type where converters are expected."""
 
+Item = TypeVar("Item")
+
 DEFAULT_CONVERTERS: Config = {
     "number": {"threshold": 0.95, "allow_unsigned_int": True, "decimal": DecimalMode.INFER},
     "boolean": {"threshold": 1.0},
@@ -47,6 +66,419 @@ def ensure_converters(converters: Converters = None) -> list[Converter]:
     raise ValueError(f"Object cannot be made into type converters: {converters}")
 
 
+def n_workers(n_jobs: int | None) -> int:
+    """Number of workers, where None means 1 and negative numbers count back from n_cpus + 1."""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+
+    return n_jobs
+
+
+def map_columns(
+    func: Callable[[str], Item],
+    names: list[str],
+    n_jobs: int | None = None,
+    desc: str = "Casting",
+    log: bool = False,
+) -> list[Item]:
+    """Apply function to each column name, optionally in a pool of threads.
+
+    Arrow's compute kernels release the GIL, so columns can be converted concurrently.
+    """
+    n_workers_ = min(n_workers(n_jobs), len(names))
+
+    if n_workers_ <= 1:
+        return [func(name) for name in tqdm(names, desc=desc, disable=not log)]
+
+    with ThreadPoolExecutor(max_workers=n_workers_) as pool:
+        results = pool.map(func, names)
+        return list(tqdm(results, total=len(names), desc=desc, disable=not log))
+
+
+def with_conversions(table: Table, conversions: dict[str, Conversion | None]) -> Table:
+    """Replace columns in table with results of conversions, including their metadata."""
+    fields = list(table.schema)
+    columns = list(table.columns)
+
+    for name, conv in conversions.items():
+        if conv is None:
+            continue
+
+        result = conv.result
+        meta = conv.meta or {}
+        meta = encode_metadata(meta) if meta else None
+        idx = table.schema.get_field_index(name)
+        fields[idx] = pa.field(name, type=result.type, metadata=meta)
+        columns[idx] = result
+
+    schema = pa.schema(fields, metadata=table.schema.metadata)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def widen_type(type: DataType) -> DataType:
+    """Widest type of the same kind, such that different batches can share a schema."""
+    if pat.is_integer(type):
+        return pa.int64() if pat.is_signed_integer(type) else pa.uint64()
+
+    if pat.is_list(type) and pat.is_integer(type.value_type):
+        return pa.list_(widen_type(type.value_type))
+
+    return type
+
+
+def retype_field(field: Field, type: DataType) -> Field:
+    """Change a field's (numeric) type, keeping its semantic metadata consistent."""
+    if type == field.type:
+        return field
+
+    meta = decode_metadata(field.metadata or {})
+    if "semantic" in meta:
+        before, after = str(field.type), str(type)
+        if pat.is_list(type) and pat.is_list(field.type):
+            before, after = str(field.type.value_type), str(type.value_type)
+
+        semantic = meta["semantic"].replace(before, after)
+        semantic = semantic.replace(before.capitalize(), after.capitalize())
+        meta["semantic"] = semantic.replace("Uint", "UInt")
+
+    return pa.field(field.name, type, metadata=encode_metadata(meta) if meta else None)
+
+
+def widen_field(field: Field) -> Field:
+    """Widen a field's integer type, keeping its semantic metadata consistent."""
+    return retype_field(field, widen_type(field.type))
+
+
+def unify_fields(fields: list[Field]) -> Field:
+    """Find a common field for all fields having the same name.
+
+    Numeric types are promoted as necessary (e.g. integers widened), and incompatible string-like
+    types (e.g. categorical in one, and text in another table) fall back to strings.
+    """
+    first = fields[0]
+
+    try:
+        schemas = [pa.schema([field]) for field in fields]
+        type = pa.unify_schemas(schemas, promote_options="permissive").field(first.name).type
+    except (pa.ArrowTypeError, pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        if not all(is_stringy(field.type) or pat.is_null(field.type) for field in fields):
+            types = ", ".join(str(field.type) for field in fields)
+            raise ValueError(f"Cannot unify types of column '{first.name}': {types}") from None
+
+        return pa.field(first.name, pa.string())
+
+    unified = (field for field in fields if field.type == type)
+    return next(unified, None) or retype_field(first, type)
+
+
+def unify_tables(tables: list[Table]) -> list[Table]:
+    """Make tables conform to a common schema, filling missing columns with nulls."""
+    names = list(dict.fromkeys(name for table in tables for name in table.column_names))
+    fields = [
+        unify_fields([table.field(name) for table in tables if name in table.column_names])
+        for name in names
+    ]
+    schema = pa.schema(fields)
+
+    unified = []
+    for table in tables:
+        columns = [
+            table.column(field.name).cast(field.type)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        unified.append(pa.Table.from_arrays(columns, schema=schema))
+
+    return unified
+
+
+def fit_array(array: Array, type: DataType, name: str, coerce: bool = False) -> Array:
+    """Cast array to type, raising an error naming the column if any value doesn't fit.
+
+    With ``coerce``, values that don't fit (e.g. floats in an integer column) become nulls instead.
+    """
+    try:
+        return array.cast(type)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+        if not coerce:
+            msg = f"Column '{name}' of batch doesn't fit type {type} of initial batches: {exc}"
+            raise ValueError(msg + " (a strategy with coerce=True would use nulls).") from None
+
+    try:
+        unsafe = array.cast(type, safe=False)
+        fits = pac.equal(unsafe.cast(array.type, safe=False), array)
+        result = pac.if_else(fits, unsafe, pa.nulls(len(array), type))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        result = pa.nulls(len(array), type)
+
+    n_lost = result.null_count - array.null_count
+    LOG.warning(f"Column '{name}' of batch has {n_lost} values not fitting {type}, using nulls.")
+    return result
+
+
+def cast_batch(
+    batch: RecordBatch,
+    converters: dict[str, Converter],
+    schema: Schema,
+    coerce: bool = False,
+) -> RecordBatch:
+    """Convert a batch with known converters per column and make it conform to schema.
+
+    If a converter declines the batch (e.g. a text column containing a single repeated value), the
+    original column is cast to the schema's type directly, rather than ending the stream. With
+    ``coerce``, the converter is first tried once more with a threshold of 0.
+    """
+    arrays = []
+
+    for target in schema:
+        array = batch.column(target.name)
+        converter = converters.get(target.name)
+
+        if converter is not None and array.null_count < len(array):
+            conv = converter.convert(array)
+            if conv is None and coerce:
+                conv = replace(converter, threshold=0.0).convert(array)
+
+            if conv is not None:
+                array = conv.result
+            else:
+                LOG.warning(
+                    f"Converter {iformat(converter)} declined column '{target.name}' of batch, "
+                    f"casting it to {target.type} directly."
+                )
+
+        arrays.append(fit_array(array, target.type, target.name, coerce))
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def json_param(value):
+    """Make a converter parameter json-serializable."""
+    if isinstance(value, DataType):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [json_param(v) for v in value]
+
+    return value
+
+
+NATIVE_CONVERTERS = ("category", "text", "url")
+"""Converters whose results Arrow's CSV parser can produce directly given the target type."""
+
+ELEMENTWISE_CONVERTERS = ("boolean", "list", "number", "timestamp", "url")
+"""Converters whose result for each value doesn't depend on other values (unlike e.g. the
+cardinality-based category converter). These can be applied to a column's distinct values only.
+"""
+
+
+@dataclass
+class UniqueValues:
+    """A column's distinct non-null values, their counts, and (lazily) each row's index into them.
+
+    The indices are only calculated when needed to expand a conversion, i.e. not for columns
+    rejected because of their cardinality.
+    """
+
+    values: Array
+    counts: Array
+    array: Array | ChunkedArray = field(repr=False)
+
+    @classmethod
+    def from_array(cls, array: Array | ChunkedArray) -> UniqueValues:
+        counts = pac.value_counts(array)
+        valid = counts.field("values").is_valid()
+        counts = counts.filter(valid)
+        return cls(counts.field("values"), counts.field("counts"), array)
+
+    @cached_property
+    def indices(self) -> Array | ChunkedArray:
+        return pac.index_in(self.array, value_set=self.values, skip_nulls=True)
+
+    def proportion_valid(self, converted: Array) -> float:
+        """Proportion of (non-null) rows valid after conversion, given the converted values."""
+        n_valid = pac.sum(self.counts.filter(converted.is_valid())).as_py() or 0
+        return n_valid / pac.sum(self.counts).as_py()
+
+    def expand(self, converted: Array) -> Array | ChunkedArray:
+        """Map converted distinct values back to all rows."""
+        return converted.take(self.indices)
+
+    def resolve(self, converter: Converter) -> Converter | None:
+        """Fix parameters a converter would otherwise infer from the distinct values alone.
+
+        A number's decimal delimiter is inferred with each distinct value weighted by its count,
+        as if from all rows. Returns None if it is ambiguous (while some values do contain
+        delimiters), in which case the whole column should be converted instead.
+        """
+        if not isinstance(converter, Number) or converter.decimal != DecimalMode.INFER:
+            return converter
+
+        decimal = infer_decimal_delimiter(self.values, weights=self.counts)
+        if decimal is not None:
+            return replace(converter, decimal=decimal)
+
+        # Integers don't depend on the frequency of values
+        has_delimiters = pac.any(pac.match_substring_regex(self.values, "[.,]")).as_py()
+        return None if has_delimiters else converter
+
+
+def parses_natively(array: Array | ChunkedArray, type: DataType) -> bool:
+    """Whether Arrow itself can parse all (non-missing) strings in the array as the given type.
+
+    Unlike converters, Arrow doesn't accept any invalid values, nor e.g. positive signs.
+    """
+    if not pat.is_string(array.type):
+        return False
+
+    missing = pac.is_in(array, value_set=pa.array(["", *MISSING_STRINGS]))
+    try:
+        pac.if_else(missing, None, array).cast(type)
+        return True
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+
+
+@dataclass
+class ColumnPlan:
+    """How a single column was converted, with all parameters needed to replay it."""
+
+    converter: str
+    """Registered name of the converter."""
+    params: dict = field(default_factory=dict)
+    """Converter parameters, including those resolved during inference."""
+    type: str | None = None
+    """The resulting Arrow type."""
+    meta: dict = field(default_factory=dict)
+    """The resulting field metadata."""
+    exact: bool = False
+    """Whether Arrow could parse all original values itself (numbers only)."""
+
+    @classmethod
+    def from_conversion(
+        cls,
+        conv: Conversion,
+        array: Array | ChunkedArray | None = None,
+    ) -> ColumnPlan:
+        converter = conv.converter
+        name = type(converter).__name__.lower()
+        params = asdict(converter) | conv.params
+        result_type = conv.result.type
+        exact = (
+            array is not None
+            and name == "number"
+            and parses_natively(array, widen_type(result_type))
+        )
+        return cls(
+            converter=name,
+            params={key: json_param(value) for key, value in params.items()},
+            type=str(result_type),
+            meta=conv.meta or {},
+            exact=exact,
+        )
+
+    def make_converter(self) -> Converter:
+        return Registry[self.converter](**self.params)
+
+    def arrow_type(self) -> DataType | None:
+        return type_from_string(self.type) if self.type is not None else None
+
+    def is_native(self) -> bool:
+        """Whether Arrow can parse the column into its final type without conversion.
+
+        Numbers only qualify if Arrow could parse all values of the original column itself.
+        """
+        if self.converter in NATIVE_CONVERTERS:
+            return True
+
+        if self.converter == "number" and self.exact:
+            type = self.arrow_type()
+            return pat.is_integer(type) or self.params.get("decimal") == "."
+
+        return False
+
+    def native_type(self) -> DataType:
+        """Type for Arrow's parser, with integers widened so that other files' values fit."""
+        return widen_type(self.arrow_type())
+
+
+@dataclass
+class CastPlan:
+    """Serializable record of inferred conversions, to be replayed on files of the same layout.
+
+    Obtain one from a cast strategy after casting (``strategy.plan``), store it with
+    ``to_json()``, and later replay it without any inference using ``to_cast()``.
+    """
+
+    columns: dict[str, ColumnPlan] = field(default_factory=dict)
+
+    @classmethod
+    def from_conversions(
+        cls,
+        conversions: dict[str, Conversion | None],
+        table: Table | None = None,
+    ) -> CastPlan:
+        """Plan from conversions, optionally checking which original columns Arrow can parse."""
+        columns = {
+            name: ColumnPlan.from_conversion(
+                conv, table.column(name) if table is not None else None
+            )
+            for name, conv in conversions.items()
+            if conv is not None and conv.converter is not None
+        }
+        return cls(columns)
+
+    def converters(self) -> dict[str, Converter]:
+        return {name: col.make_converter() for name, col in self.columns.items()}
+
+    def types(self) -> dict[str, DataType]:
+        return {name: col.arrow_type() for name, col in self.columns.items()}
+
+    def column_types(self) -> dict[str, DataType]:
+        """Types of columns Arrow can parse directly, e.g. to be passed as ``read_csv(types=...)``.
+
+        Integer types are widened to 64 bits. Remaining columns can be converted with
+        ``to_cast(exclude=plan.column_types())``.
+        """
+        return {name: col.native_type() for name, col in self.columns.items() if col.is_native()}
+
+    def to_cast(
+        self,
+        exclude: Iterable[str] | None = None,
+        log: bool = False,
+        n_jobs: int | None = None,
+    ) -> Cast:
+        """Explicit cast replaying the plan, ensuring identical types and metadata."""
+        exclude = set(exclude or ())
+        columns = {name: col for name, col in self.columns.items() if name not in exclude}
+        return Cast(
+            converters={name: col.make_converter() for name, col in columns.items()},
+            log=log,
+            n_jobs=n_jobs,
+            types={name: col.arrow_type() for name, col in columns.items()},
+            meta={name: col.meta for name, col in columns.items()},
+        )
+
+    def to_dict(self) -> dict:
+        return {name: asdict(col) for name, col in self.columns.items()}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> CastPlan:
+        return cls({name: ColumnPlan(**col) for name, col in d.items()})
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, s: str) -> CastPlan:
+        return cls.from_dict(json.loads(s))
+
+
 @dataclass
 class CastStrategy(ABC):
     """Base class for autocasting implementations."""
@@ -54,6 +486,15 @@ class CastStrategy(ABC):
     converters: Converters | None = None
     columns: list[str] | None = None
     log: bool = False
+    n_jobs: int | None = None
+    """Number of threads converting columns concurrently (None: 1, -1: all CPUs)."""
+    profile: Profile | None = field(default=None, repr=False)
+    """Optionally record resources used by each conversion attempt."""
+    coerce: bool = False
+    """When casting batches, replace values of later batches not fitting the types inferred
+    from the initial ones with nulls (rather than raising an error)."""
+    plan: CastPlan | None = field(default=None, init=False, repr=False)
+    """Replayable record of the conversions inferred by the last cast."""
 
     def __post_init__(self):
         self.converters = ensure_converters(self.converters)
@@ -62,21 +503,19 @@ class CastStrategy(ABC):
     def cast_array(self, array: Array, name: str | None = None) -> Conversion:
         """Only need to override this."""
 
+    def convert_columns(self, table: Table) -> dict[str, Conversion | None]:
+        """Infer conversions for all (configured) columns in table, recording them as a plan."""
+        columns = self.columns or table.column_names
+        convert = lambda name: self.cast_array(table.column(name), name=name)
+        conversions = map_columns(convert, columns, self.n_jobs, "Autocasting", self.log)
+        conversions = dict(zip(columns, conversions))
+        self.plan = CastPlan.from_conversions(conversions, table)
+        return conversions
+
     def cast_table(self, table: Table) -> Table:
         """Takes care of updating fields, including metadata etc."""
         schema = table.schema
-        columns = self.columns or table.column_names
-
-        for name in tqdm(columns, desc="Autocasting", disable=not self.log):
-            array = table.column(name)
-            conv = self.cast_array(array, name=name)
-
-            if conv is not None:
-                result = conv.result
-                meta = conv.meta or {}
-                meta = encode_metadata(meta) if meta else None
-                field = pa.field(name, type=result.type, metadata=meta)
-                table = table.set_column(table.column_names.index(name), field, result)
+        table = with_conversions(table, self.convert_columns(table))
 
         if self.log:
             diff = schema_diff(schema, table.schema)
@@ -85,6 +524,40 @@ class CastStrategy(ABC):
 
         return table
 
+    def cast_batches(
+        self,
+        batches: Iterable[RecordBatch],
+        n_batches: int = 1,
+    ) -> Iterator[RecordBatch]:
+        """Infer conversions from the first n batches and apply them to all batches.
+
+        Later batches are converted by replaying the plan inferred from the initial ones, i.e.
+        with all parameters resolved during inference (e.g. timestamp format or decimal separator)
+        fixed. To guarantee a single schema for all batches, integer types are widened to 64 bits.
+        Values of later batches that don't fit the schema (e.g. floats in an integer column)
+        raise an error, unless the strategy was configured with ``coerce=True``, in which case
+        they become nulls (with a warning).
+        """
+        batches = iter(batches)
+        head = list(islice(batches, n_batches))
+        if not head:
+            return
+
+        table = pa.Table.from_batches(head)
+        conversions = self.convert_columns(table)
+        table = with_conversions(table, conversions)
+        converters = self.plan.converters()
+
+        schema = pa.schema(widen_field(field) for field in table.schema)
+
+        if self.log:
+            LOG.info(pformat(schema_view(schema, title="Batch schema")))
+
+        yield from table.cast(schema).combine_chunks().to_batches()
+
+        for batch in batches:
+            yield cast_batch(batch, converters, schema, self.coerce)
+
     def cast(self, data: Array | ChunkedArray | Table) -> Conversion | Table:
         """Shouldn't be necessary, but @singledispatchmethod doesn't work with inheritance."""
         if isinstance(data, (Array, ChunkedArray)):
@@ -101,34 +574,45 @@ class Autocast(CastStrategy):
     """Simple cast trying each registered type in order.
 
     As a little performance optimization (having a huge effect on execution time),
-    types are first tested on a sample for fast rejection of non-matching types.
+    types are first tested on a sample for fast rejection of non-matching types. The
+    sample is drawn once per column, stratified across the whole column (see utils.sample()),
+    so that it is representative also of e.g. sorted data or junk at the top of a file.
     """
 
     n_samples: int = 100
     fallback: Converter | None = field(
         default_factory=lambda: Category(threshold=0.0, max_cardinality=None)
     )
+    seed: int | None = 0
+    """Seed for drawing (reproducible) random samples."""
+    max_unique: float | None = None
+    """If given, string columns with at most this proportion of distinct values are converted by
+    elementwise converters on their distinct values only, and the result expanded back to all
+    rows. Converters' thresholds then apply to the proportion of valid rows (not values)."""
 
     def cast_array(self, array: Array | ChunkedArray, name: str | None = None) -> Conversion:
         name = name or ""
+        unique = cache(lambda: UniqueValues.from_array(array))
 
         if array.null_count == len(array):
             if self.fallback:
                 LOG.info(f"Column '{name}' is all null, trying fallback {iformat(self.fallback)}")
-                return self.fallback.convert(array)
+                return self.fallback_convert(array, name)
 
             LOG.debug(f"Column '{name}' is all null, skipping.")
             return None
 
+        sample = sample_valid(array, self.n_samples, seed=self.seed)
+
         for converter in self.converters:
-            sample = array.drop_null().slice(length=self.n_samples)
             if (
                 len(sample) > 0
-                and converter.convert(sample)
-                and (result := converter.convert(array))
+                and self.attempt(converter, sample, name, "sample")
+                and (result := self.convert_full(converter, array, name, unique))
             ):
                 if self.log:
                     LOG.debug(f'Converted column "{name}" with converter\n{iformat(converter)}')
+                result.converter = converter
                 return result
 
         if self.fallback and pa.types.is_string(array.type) or pa.types.is_null(array.type):
@@ -136,10 +620,60 @@ class Autocast(CastStrategy):
                 f"Got no matching converter for string column '{name}'. "
                 f"Will try fallback {iformat(self.fallback)}."
             )
-            return self.fallback.convert(array)
+            return self.fallback_convert(array, name)
 
         return None
 
+    def attempt(
+        self,
+        converter: Converter,
+        array: Array | ChunkedArray,
+        name: str,
+        stage: str,
+    ) -> Conversion | None:
+        """Try a converter, recording the attempt if profiling."""
+        label = f"convert/{type(converter).__name__.lower()}"
+        with record(self.profile, label, column=name, stage=stage) as span:
+            result = converter.convert(array)
+            span.bytes = array.nbytes
+            span.meta["accepted"] = result is not None
+
+        return result
+
+    def convert_full(
+        self,
+        converter: Converter,
+        array: Array | ChunkedArray,
+        name: str,
+        unique: Callable[[], UniqueValues],
+    ) -> Conversion | None:
+        """Convert the whole column, via its distinct values if possible.
+
+        ``unique`` lazily calculates (and caches) the column's distinct values. If the converter
+        rejects them, or too few rows would be valid, falls back to converting all rows.
+        """
+        if (
+            self.max_unique is not None
+            and type(converter).__name__.lower() in ELEMENTWISE_CONVERTERS
+            and pa.types.is_string(array.type)
+            and len(unique().values) <= self.max_unique * (len(array) - array.null_count)
+        ):
+            uniq = unique()
+            resolved = uniq.resolve(converter)
+            result = resolved and self.attempt(resolved, uniq.values, name, "unique")
+            if result is not None and uniq.proportion_valid(result.result) >= converter.threshold:
+                result.result = uniq.expand(result.result)
+                return result
+
+        return self.attempt(converter, array, name, "full")
+
+    def fallback_convert(self, array: Array | ChunkedArray, name: str = "") -> Conversion | None:
+        result = self.attempt(self.fallback, array, name, "fallback")
+        if result is not None:
+            result.converter = self.fallback
+
+        return result
+
 
 @dataclass
 class Cast:
@@ -147,35 +681,62 @@ class Cast:
 
     converters: dict[str, Converter]
     log: bool = False
+    n_jobs: int | None = None
+    """Number of threads converting columns concurrently (None: 1, -1: all CPUs)."""
+    types: dict[str, DataType] | None = None
+    """Optional target type per column, e.g. to enforce integer widths from a cast plan."""
+    meta: dict[str, dict] | None = None
+    """Optional field metadata per column, e.g. to keep semantic types from a cast plan."""
+
+    def convert_column(self, table: Table, name: str) -> Conversion | None:
+        array = table.column(name)
+        converter = self.converters[name]
+        type = (self.types or {}).get(name)
+        meta = (self.meta or {}).get(name)
+
+        if type is not None and array.null_count == len(array):
+            return Conversion(array.cast(type), meta or {})
+
+        try:
+            conv = converter.convert(array)
+        except pa.ArrowInvalid as exc:
+            # E.g. list elements not fitting the planned element type
+            LOG.error(f"Couldn't convert column {name} with converter {iformat(converter)}: {exc}")
+            conv = None
+        except Exception:
+            LOG.error(f"Couldn't convert column {name} with converter {iformat(converter)}!")
+            raise
+
+        if conv is None:
+            LOG.error(
+                f"Conversion of columns '{name}' with converter '{iformat(converter)}' failed!"
+            )
+            LOG.error(f"Original column ({array.type}):\n{array}")
+            return conv
+
+        if type is not None and conv.result.type != type:
+            try:
+                conv.result = conv.result.cast(type)
+            except pa.ArrowInvalid:
+                # E.g. larger values than in the file the plan was inferred from
+                LOG.warning(
+                    f"Converted column '{name}' doesn't fit planned type {type}, "
+                    f"keeping {conv.result.type}."
+                )
+                return conv
+
+        if meta is not None:
+            conv.meta = meta
+
+        return conv
 
     def cast(self, table: Table) -> Table:
         schema = table.schema
 
-        for _, (name, converter) in tqdm(
-            enumerate(self.converters.items()),
-            total=len(self.converters),
-            desc="Explicit casting",
-            disable=not self.log,
-        ):
-            array = table.column(name)
-            try:
-                conv = converter.convert(array)
-            except Exception:
-                LOG.error(f"Couldn't convert column {name} with converter {iformat(converter)}!")
-                raise
-
-            if conv is not None:
-                result = conv.result
-                meta = conv.meta or {}
-                meta = encode_metadata(meta) if meta else None
-                field = pa.field(name, type=result.type, metadata=meta)
-                idx = table.schema.get_field_index(name)
-                table = table.set_column(idx, field, result)
-            else:
-                LOG.error(
-                    f"Conversion of columns '{name}' with converter '{iformat(converter)}' failed!"
-                )
-                LOG.error(f"Original column ({array.type}):\n{array}")
+        names = list(self.converters)
+        convert = lambda name: self.convert_column(table, name)
+        conversions = map_columns(convert, names, self.n_jobs, "Explicit casting", self.log)
+        table = with_conversions(table, dict(zip(names, conversions)))
 
         if self.log:
             diff = schema_diff(schema, table.schema)
@@ -183,3 +744,8 @@ class Cast:
                 LOG.info(pformat(schema_diff_view(diff, title="Changed types")))
 
         return table
+
+    def cast_batches(self, batches: Iterable[RecordBatch]) -> Iterator[RecordBatch]:
+        """Cast each batch independently."""
+        for batch in batches:
+            yield from self.cast(pa.Table.from_batches([batch])).combine_chunks().to_batches()
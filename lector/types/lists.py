@@ -7,6 +7,7 @@ Currently NOT supported in CSV strings:
 """
 from __future__ import annotations
 
+import re
 from collections.abc import Iterable
 from contextlib import suppress
 from csv import reader as csvreader
@@ -16,18 +17,21 @@ import msgspec
 import pyarrow as pa
 import pyarrow.compute as pac
 import pyarrow.types as pat
-from pyarrow import Array, DataType
+from pyarrow import Array, ChunkedArray, DataType
 
 from ..log import LOG
-from ..utils import ensure_type, min_max, proportion_trueish, smallest_int_type
+from ..utils import ensure_type, min_max, proportion_trueish, sample, smallest_int_type
 from .abc import Conversion, Converter, Registry
-from .regex import RE_LIST_CLEAN, RE_LIST_LIKE
+from .regex import RE_LIST_CLEAN, RE_LIST_LIKE, RE_LIST_NESTED
 from .strings import proportion_url
 
 LIST_TYPES: tuple[str] = (pa.int64(), pa.float64(), pa.timestamp(unit="ms"))
 
 JSON_DECODE = msgspec.json.Decoder(type=list).decode
 
+CAST_SAMPLES: int = 1000
+"""Number of list elements used to reject element types before casting all lists."""
+
 SAFE_CSV_PARSING = False
 
 
@@ -79,6 +83,65 @@ def parse_lists_json(arr: Array) -> Array:
     return pa.array(parsed)
 
 
+def split_lists(arr: Array | ChunkedArray, delimiter: str = ",") -> Array | ChunkedArray:
+    """Split (cleaned) strings at delimiter using Arrow kernels only.
+
+    Equivalent to the CSV parser (see parse_lists_csv()) for strings without quotes, i.e.
+    elements are stripped of spaces and single quotes, and empty strings become empty lists.
+    """
+    if isinstance(arr, ChunkedArray):
+        chunks = [split_lists(chunk, delimiter) for chunk in arr.chunks]
+        return pa.chunked_array(chunks, type=pa.list_(pa.string()))
+
+    split = pac.split_pattern(arr, pattern=delimiter)
+    split = pac.if_else(pac.equal(arr, ""), pa.scalar([], type=split.type), split)
+    values = pac.utf8_trim(split.values, characters="' ")
+    return pa.ListArray.from_arrays(split.offsets, values, mask=split.is_null())
+
+
+def parse_lists_quoted(arr: Array, **kwds) -> Array:
+    """Parse strings as lists row by row, using json or, failing that, csv."""
+    try:
+        result = parse_lists_json(arr)
+        LOG.debug("[List] Was able to fast-parse as json")
+    except Exception:
+        result = parse_lists_csv(arr, **kwds)
+
+    return result
+
+
+def parse_lists(
+    arr: Array,
+    quote_char: str = '"',
+    delimiter: str = ",",
+) -> Array | ChunkedArray:
+    """Parse strings as lists, splitting simple lists with Arrow kernels.
+
+    Only strings containing quotes or nested brackets need a proper (row by row) parser.
+    """
+    content = pac.replace_substring_regex(arr, pattern=RE_LIST_CLEAN, replacement="")
+    pattern = f"[{re.escape(quote_char)}{RE_LIST_NESTED}]"
+    quoted = pac.fill_null(pac.match_substring_regex(content, pattern=pattern), False)
+    kwds = {"skipinitialspace": True, "quotechar": quote_char, "delimiter": delimiter}
+
+    if not pac.any(quoted).as_py():
+        return split_lists(content, delimiter=delimiter)
+
+    if pac.all(pac.or_(quoted, arr.is_null())).as_py():
+        return parse_lists_quoted(arr, **kwds)
+
+    LOG.debug("[List] Splitting simple lists and parsing quoted lists separately")
+    idx_simple = pac.indices_nonzero(pac.invert(quoted))
+    idx_quoted = pac.indices_nonzero(quoted)
+    simple = split_lists(content.take(idx_simple), delimiter=delimiter)
+    other = parse_lists_quoted(arr.take(idx_quoted), **kwds).cast(simple.type)
+
+    chunks = lambda arr: arr.chunks if isinstance(arr, ChunkedArray) else [arr]
+    result = pa.chunked_array(chunks(simple) + chunks(other), type=simple.type)
+    order = pac.sort_indices(pa.chunked_array(chunks(idx_simple) + chunks(idx_quoted)))
+    return result.take(order)
+
+
 def proportion_listlike(arr: Array) -> float:
     """Calculate proportion of non-null strings that could be lists."""
     valid = arr.drop_null()
@@ -92,6 +155,7 @@ def maybe_cast_lists(
     downcast: bool = True,
 ) -> Array | None:
     """Cast lists (of strings) to first valid type, if any."""
+    probe = sample(pac.list_flatten(arr), CAST_SAMPLES)
 
     for type in types:
         type = ensure_type(type)
@@ -100,6 +164,7 @@ def maybe_cast_lists(
             return arr
 
         with suppress(Exception):
+            pac.cast(probe, type)  # Arrow is slow to reject invalid casts of large arrays
             result = pac.cast(arr, pa.list_(type))
 
             if type == "int64" and downcast:
@@ -131,16 +196,10 @@ def maybe_parse_lists(
         return None
 
     try:
-        result = parse_lists_json(arr)
-        LOG.debug("[List] Was able to fast-parse as json")
-    except Exception:
-        try:
-            result = parse_lists_csv(
-                arr, skipinitialspace=True, quotechar=quote_char, delimiter=delimiter
-            )
-        except Exception as exc:
-            LOG.error(f"Cannot parse lists as CSV: {exc}")
-            return None
+        result = parse_lists(arr, quote_char=quote_char, delimiter=delimiter)
+    except Exception as exc:
+        LOG.error(f"Cannot parse lists as CSV: {exc}")
+        return None
 
     if type is not None:
         return result.cast(pa.list_(ensure_type(type)))
@@ -148,6 +207,17 @@ def maybe_parse_lists(
     return maybe_cast_lists(result, types=LIST_TYPES) or result
 
 
+def widen_element_type(type: DataType) -> DataType:
+    """Element type lists were cast to before downcasting (e.g. int64 rather than uint8)."""
+    if pat.is_integer(type):
+        return pa.int64()
+
+    if pat.is_floating(type):
+        return pa.float64()
+
+    return type
+
+
 @dataclass
 @Registry.register
 class List(Converter):
@@ -175,6 +245,8 @@ class List(Converter):
             return None
 
         vtype = result.type.value_type
+        # Replaying the conversion must not reject larger numbers than those inferred from
+        ptype = widen_element_type(vtype)
 
         if pat.is_string(vtype):
             if self.infer_urls and proportion_url(pac.list_flatten(result)) >= self.threshold_urls:
@@ -192,4 +264,4 @@ class List(Converter):
 
             semantic = f"list[number[{vtype}]]"
 
-        return Conversion(result, meta={"semantic": semantic})
+        return Conversion(result, meta={"semantic": semantic}, params={"type": str(ptype)})
@@ -6,7 +6,6 @@ https://github.com/google/re2/wiki/Syntax
 """
 from __future__ import annotations
 
-from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 
@@ -19,8 +18,10 @@ from ..log import LOG
 from ..utils import (
     dtype_name,
     empty_to_null,
+    map_chunks,
     min_max,
     proportion_equal,
+    sample,
     smallest_int_type,
 )
 from .abc import Conversion, Converter, Registry
@@ -96,17 +97,85 @@ def decimal_delimiter(  # noqa: PLR0911, PLR0912
     return None
 
 
-def infer_decimal_delimiter(arr: Array) -> str | None:
+def extract_delimiter(arr: Array, pattern: str) -> Array:
+    """Extract the delimiter captured by pattern as strings (null where not matching)."""
+    extracted = pac.extract_regex(arr, pattern)
+    return pac.if_else(extracted.is_valid(), pac.struct_field(extracted, [0]), None)
+
+
+def decimal_delimiters(arr: Array, n_chars_max: int = 20) -> Array:
+    """Vectorized version of decimal_delimiter(), inferring the delimiter of each string at once.
+
+    Each rule of the scalar version is expressed as a regex or count over the whole array.
+    The rules are then combined in the order in which they apply to a string's first delimiter.
+    """
+    # First delimiter at 1st position, or 2nd after a "0": can only be decimal (".12", "0.12")
+    initial = extract_delimiter(arr, r"(?s)^0?(?P<delim>[.,])")
+    # First delimiter at 5th position or later: cannot be thousands (1234.00)
+    late = extract_delimiter(arr, rf"(?s)^[^.,]{{4,{n_chars_max}}}(?P<delim>[.,])")
+    # First delimiter at 2nd to 4th position: find out in combination with other delimiters
+    early = pac.match_substring_regex(arr, r"(?s)^[^.,]{1,3}[.,]")
+    # First delimiter with less than 3 characters after it: cannot be thousands (1.12)
+    trailing = extract_delimiter(arr, r"(?s)(?P<delim>[.,]).{0,2}$")
+
+    n_dots = pac.count_substring(arr, ".")
+    n_commas = pac.count_substring(arr, ",")
+    first_dot = pac.find_substring(arr, ".")
+    first_comma = pac.find_substring(arr, ",")
+    no_dots = pac.equal(n_dots, 0)
+    no_commas = pac.equal(n_commas, 0)
+
+    counted = pac.case_when(
+        pac.make_struct(
+            pac.and_(pac.equal(n_dots, 1), no_commas),
+            pac.and_(pac.invert(no_dots), pac.invert(no_commas)),
+            pac.and_(pac.equal(n_commas, 1), no_dots),
+            pac.greater(n_commas, 1),
+            pac.greater(n_dots, 1),
+        ),
+        ".",
+        pac.if_else(pac.less(first_comma, first_dot), ".", ","),
+        ",",
+        ".",
+        ",",
+    )
+
+    return pac.case_when(
+        pac.make_struct(initial.is_valid(), late.is_valid(), early),
+        initial,
+        late,
+        pac.coalesce(trailing, counted),
+    )
+
+
+def infer_decimal_delimiter(
+    arr: Array,
+    n_samples: int | None = None,
+    weights: Array | None = None,
+) -> str | None:
     """Get most frequent decimal delimiter in array.
 
     If most frequent delimiter doesn't occur in sufficient proportion (support),
     or not significantly more often than other delimiters (confidence), returns
-    None.
+    None. If n_samples is given, infers the delimiter from a sample of that size.
+    If weights are given (e.g. the counts of distinct values), each value counts
+    as often as its weight, and no sample is taken.
     """
-    n = len(arr)
-    counts = Counter(decimal_delimiter(s.as_py()) for s in arr)
-    counts.update({".": 0, ",": 0})
-    ranked = [d for d in counts.most_common(3) if d[0]]
+    if weights is None and n_samples is not None:
+        arr = sample(arr, n_samples)
+
+    delims = map_chunks(decimal_delimiters, arr)
+    if weights is None:
+        n = len(arr)
+        counts = {delim: pac.sum(pac.equal(delims, delim)).as_py() or 0 for delim in ".,"}
+    else:
+        n = pac.sum(weights).as_py() or 0
+        counts = {
+            delim: pac.sum(weights.filter(pac.equal(delims, delim))).as_py() or 0
+            for delim in ".,"
+        }
+
+    ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
 
     if all(delim[1] == 0 for delim in ranked):
         return None
@@ -149,13 +218,17 @@ def clean_float_strings(arr: Array, decimal: str) -> tuple[Array, Array, float]:
     """
     thousands = "," if decimal == "." else "."
     pattern = clean_float_pattern(thousands)
-    clean = pac.replace_substring_regex(arr, pattern=pattern, replacement="")
-    if decimal == ",":
-        clean = pac.replace_substring(clean, pattern=",", replacement=".", max_replacements=1)
 
-    # Arrow doesn't recognize upper case exponential ("1.03481E-11")
-    clean = pac.utf8_lower(clean)
-    is_float = pac.match_substring_regex(clean, pattern=RE_IS_FLOAT)
+    def clean_floats(arr: Array) -> Array:
+        clean = pac.replace_substring_regex(arr, pattern=pattern, replacement="")
+        if decimal == ",":
+            clean = pac.replace_substring(clean, pattern=",", replacement=".", max_replacements=1)
+
+        # Arrow doesn't recognize upper case exponential ("1.03481E-11")
+        return pac.utf8_lower(clean)
+
+    clean = map_chunks(clean_floats, arr)
+    is_float = map_chunks(lambda a: pac.match_substring_regex(a, pattern=RE_IS_FLOAT), clean)
 
     if is_float.null_count == len(is_float):
         prop_valid = 0.0
@@ -175,7 +248,7 @@ def maybe_parse_ints(
     Arrow's internal casting from string to int doesn't allow for an
     initial positive sign character, so we have to handle that separately.
     """
-    is_int = pac.match_substring_regex(arr, pattern=RE_IS_INT)
+    is_int = map_chunks(lambda a: pac.match_substring_regex(a, pattern=RE_IS_INT), arr)
     if is_int.null_count == len(is_int):
         return None
 
@@ -183,15 +256,18 @@ def maybe_parse_ints(
     if valid_prop < threshold:
         return None
 
-    clean = pac.if_else(is_int, arr, None)
-    clean = pac.replace_substring_regex(clean, r"^\+", "")
+    clean = map_chunks(
+        lambda a, valid: pac.replace_substring_regex(pac.if_else(valid, a, None), r"^\+", ""),
+        arr,
+        is_int,
+    )
 
     try:
-        return pac.cast(clean, pa.int64())
+        return map_chunks(lambda a: pac.cast(a, pa.int64()), clean)
     except Exception:
         if allow_unsigned:
             try:
-                return pac.cast(clean, pa.uint64())
+                return map_chunks(lambda a: pac.cast(a, pa.uint64()), clean)
             except Exception as exc:
                 LOG.error(exc)
 
@@ -202,10 +278,12 @@ def maybe_parse_floats(
     arr: Array,
     threshold: float = 0.5,
     decimal: str | DecimalMode = DecimalMode.INFER,
+    n_samples: int | None = None,
+    return_decimal: bool = False,
 ) -> Array | None:
     """Parse valid string representations of floating point numbers."""
     if decimal == DecimalMode.INFER:
-        decimal = infer_decimal_delimiter(arr.drop_null())
+        decimal = infer_decimal_delimiter(arr.drop_null(), n_samples=n_samples)
         if decimal is None:
             return None
 
@@ -216,19 +294,23 @@ def maybe_parse_floats(
         result_comma = clean_float_strings(arr, decimal=",")
         if result_dot[2] >= result_comma[2]:
             clean, is_float, prop_valid = result_dot
+            decimal = "."
         else:
             clean, is_float, prop_valid = result_comma
+            decimal = ","
     else:
         raise ValueError(f"Must have decimal char or one of ['infer', 'compare']! Got '{decimal}'.")
 
     if prop_valid < threshold:
         return None
 
-    valid = pac.if_else(is_float, clean, None)  # non-floats -> null
-    valid = empty_to_null(valid)
+    def parse_floats(clean: Array, is_float: Array) -> Array:
+        valid = pac.if_else(is_float, clean, None)  # non-floats -> null
+        return pac.cast(empty_to_null(valid), pa.float64())
 
     try:
-        return pac.cast(valid, pa.float64())
+        result = map_chunks(parse_floats, clean, is_float)
+        return (result, decimal) if return_decimal else result
     except Exception as exc:
         LOG.error(exc)
 
@@ -292,8 +374,12 @@ class Number(Converter):
     decimal: str | DecimalMode = DecimalMode.INFER
     allow_unsigned_int: bool = True
     max_int: int | None = None
+    decimal_samples: int | None = None
+    """Infer the decimal delimiter from a sample of this size only (None means all values)."""
 
     def convert(self, array: Array) -> Conversion | None:
+        params = {}
+
         if pat.is_string(array.type):
             converted = maybe_parse_ints(
                 array,
@@ -306,8 +392,14 @@ class Number(Converter):
                     array,
                     threshold=self.threshold,
                     decimal=self.decimal,
+                    n_samples=self.decimal_samples,
+                    return_decimal=True,
                 )
 
+                if converted is not None:
+                    converted, decimal = converted
+                    params["decimal"] = decimal
+
             if converted is not None:
                 downcast = Downcast().convert(converted)
                 converted = downcast if downcast is not None else Conversion(converted)
@@ -325,4 +417,5 @@ class Number(Converter):
             return None
 
         converted.meta = {"semantic": f"number[{dtype_name(converted.result)}]"}
+        converted.params = params
         return converted
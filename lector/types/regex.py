@@ -17,6 +17,9 @@ RE_LIST_LIKE: str = r"^[\(\[\|][\s\S]*[\)\]\|]$"
 RE_LIST_CLEAN: str = r"^[\[\{\(\|<]|[\]\}\)\|>]$|\r?\n"
 """Remove all parenthesis-like characters from start and end as well as line breaks."""
 
+RE_LIST_NESTED: str = r"\[\]\{\}"
+"""Brackets (as character class content) indicating nested lists or objects in list elements."""
+
 
 RE_URL = (
     r"^(http://www\.|https://www\.|http://|https://)?"  # http:// or https://
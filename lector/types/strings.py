@@ -18,7 +18,14 @@ import pyarrow.types as pat
 from pyarrow import Array
 
 from ..log import LOG
-from ..utils import Number, map_values, proportion_trueish, proportion_unique, sorted_value_counts
+from ..utils import (
+    Number,
+    map_chunks,
+    map_values,
+    proportion_trueish,
+    proportion_unique,
+    sorted_value_counts,
+)
 from .abc import Conversion, Converter, Registry
 from .regex import RE_LIST_LIKE, RE_URL
 
@@ -101,7 +108,9 @@ def sufficient_texts(
 
 def proportion_url(arr: Array) -> float:
     """Use regex to find proportion of strings that are (web) URL-like."""
-    is_url = pac.match_substring_regex(arr.drop_null(), RE_URL, ignore_case=True)
+    is_url = map_chunks(
+        lambda a: pac.match_substring_regex(a, RE_URL, ignore_case=True), arr.drop_null()
+    )
     return proportion_trueish(is_url)
 
 
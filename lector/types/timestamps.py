@@ -28,16 +28,15 @@ TODO:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import ClassVar
 
 import pyarrow as pa
 import pyarrow.compute as pac
 import pyarrow.types as pat
-from pyarrow import Array, TimestampArray, TimestampScalar, TimestampType
+from pyarrow import Array, TimestampArray, TimestampType
 
 from ..log import LOG
-from ..utils import proportion_trueish
+from ..utils import map_chunks, proportion_trueish, sample_valid
 from .abc import Conversion, Converter, Registry
 from .regex import RE_FRATIONAL_SECONDS, RE_TZ_OFFSET
 
@@ -95,11 +94,14 @@ def timestamp_formats(tz: bool = True) -> list[str]:
 ALL_FORMATS: list[str] = timestamp_formats()
 """All formats tried by default if None is explicitly provided when converting."""
 
+FORMAT_SAMPLES: int = 100
+"""Number of values used to rank candidate formats before parsing a whole array."""
+
 
 def proportion_fractional_seconds(arr: Array) -> float:
     """Proportion of non-null dates in arr having fractional seconds."""
     valid = arr.drop_null()
-    has_frac = pac.match_substring_regex(valid, RE_FRATIONAL_SECONDS)
+    has_frac = map_chunks(lambda a: pac.match_substring_regex(a, RE_FRATIONAL_SECONDS), valid)
     return proportion_trueish(has_frac)
 
 
@@ -144,20 +146,32 @@ def extract_timezone(timestamps: pa.Array):
     return f"{offset[:-2]}:{offset[-2:]}"
 
 
-@lru_cache(maxsize=128, typed=False)
-def find_format(ts: TimestampScalar) -> str | None:
-    """Try to find the first format that can parse given date."""
-    if pac.is_null(ts).as_py():
-        return None
+def rank_formats(
+    arr: Array,
+    formats: list[str] = ALL_FORMATS,
+    n_samples: int = FORMAT_SAMPLES,
+    unit: str = UNIT,
+) -> list[tuple[str, float]]:
+    """Rank formats by the proportion of (sampled) non-null values each can parse.
 
-    for fmt in ALL_FORMATS:
-        try:
-            pac.strptime(ts, format=fmt, unit="s")
-            return fmt
-        except Exception:  # noqa: S112
-            continue
+    Formats are scored in order, and a format parsing all sampled values short-circuits the
+    search, since it is unambiguous and no later format could rank higher. Formats parsing
+    no values at all are dropped. Ties keep the original order of formats.
+    """
+    valid = sample_valid(arr, n_samples)
+    if len(valid) == 0:
+        return []
 
-    return None
+    scores = []
+    for fmt in formats:
+        parsed = pac.strptime(valid, format=fmt, unit=unit, error_is_null=True)
+        score = (len(valid) - parsed.null_count) / len(valid)
+        if score == 1.0:  # noqa: PLR2004
+            return [(fmt, score)]
+        if score > 0:
+            scores.append((fmt, score))
+
+    return sorted(scores, key=lambda item: item[1], reverse=True)
 
 
 def maybe_parse_known_timestamps(
@@ -170,12 +184,13 @@ def maybe_parse_known_timestamps(
 
     if threshold == 1.0:  # noqa: PLR2004
         try:
-            return pac.strptime(arr, format=format, unit=unit)
+            return map_chunks(lambda a: pac.strptime(a, format=format, unit=unit), arr)
         except Exception:
             return None
 
     valid_before = len(arr) - arr.null_count
-    result = pac.strptime(arr, format=format, unit=unit, error_is_null=True)
+    strptime = lambda a: pac.strptime(a, format=format, unit=unit, error_is_null=True)
+    result = map_chunks(strptime, arr)
     valid_after = len(result) - result.null_count
 
     if (valid_after / valid_before) < threshold:
@@ -195,26 +210,21 @@ def maybe_parse_timestamps(
     min_prop_frac_secs = 0.1
 
     if proportion_fractional_seconds(arr) > min_prop_frac_secs:
-        frac = pac.extract_regex(arr, RE_FRATIONAL_SECONDS)
-        frac = pac.struct_field(frac, indices=[0])
-        frac = fraction_as_duration(frac)
-        arr = pac.replace_substring_regex(arr, RE_FRATIONAL_SECONDS, "")
+
+        def extract_frac(a):
+            frac = pac.extract_regex(a, RE_FRATIONAL_SECONDS)
+            return fraction_as_duration(pac.struct_field(frac, indices=[0]))
+
+        frac = map_chunks(extract_frac, arr)
+        arr = map_chunks(lambda a: pac.replace_substring_regex(a, RE_FRATIONAL_SECONDS, ""), arr)
     else:
         frac = None
 
     if format is None:
-        formats = ALL_FORMATS
-        valid = arr.drop_null()
-
-        if len(valid) > 0:
-            first_date = valid[0]
-            first_format = find_format(first_date)
-            if first_format is not None:
-                LOG.info(f"Found date format '{first_format}'")
-                formats = ALL_FORMATS.copy()
-                formats.remove(first_format)
-                formats.insert(0, first_format)
-
+        ranked = rank_formats(arr, unit=unit)
+        formats = [fmt for fmt, score in ranked if score >= threshold]
+        if formats:
+            LOG.info(f"Found date format '{formats[0]}'")
     else:
         formats = [format]
 
@@ -295,9 +305,10 @@ class Timestamp(Converter):
         if tz is not None:
             if array.type.tz is None:
                 # Interpret as local moments in given timezone to convert to UTC equivalent
-                return pac.assume_timezone(
-                    array, timezone=tz, ambiguous="earliest", nonexistent="earliest"
+                assume = lambda a: pac.assume_timezone(
+                    a, timezone=tz, ambiguous="earliest", nonexistent="earliest"
                 )
+                return map_chunks(assume, array)
 
             # Keep UTC internally, simply change what local time is assumed in temporal functions
             return array.cast(pa.timestamp(unit=array.type.unit, tz=tz))
@@ -332,17 +343,19 @@ class Timestamp(Converter):
         try:
             # Pyarrow's strptime behaves different from its internal cast and inference. Only the
             # latter support timezone offset. So try cast first, and then strptime-based conversion.
-            result = array.cast(pa.timestamp(unit=self.unit))
+            result = map_chunks(lambda a: a.cast(pa.timestamp(unit=self.unit)), array)
         except pa.ArrowInvalid:
             try:
-                result = array.cast(pa.timestamp(unit=self.unit, tz="UTC"))
+                cast = lambda a: a.cast(pa.timestamp(unit=self.unit, tz="UTC"))
+                result = map_chunks(cast, array)
             except pa.ArrowInvalid:
                 result = None
 
         if result is not None:
             tz = self.tz or extract_timezone(array)
             result = self.to_timezone(result, tz or self.DEFAULT_TZ)
-            return Conversion(result, self.meta(result.type) | {"format": "arrow"})
+            params = {"tz": tz} if tz else {}
+            return Conversion(result, self.meta(result.type) | {"format": "arrow"}, params)
 
         result = maybe_parse_timestamps(
             array,
@@ -355,7 +368,8 @@ class Timestamp(Converter):
         if result is not None:
             result, format = result
             result = self.to_timezone(result, self.tz or self.DEFAULT_TZ)
-            return Conversion(result, self.meta(result.type) | {"format": format})
+            params = {"format": format}
+            return Conversion(result, self.meta(result.type) | {"format": format}, params)
 
         return None
 
@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 import json
+import os
 from collections import namedtuple
 from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from functools import singledispatch
 from time import perf_counter
 from typing import Callable, Union
 
+import numpy as np
 import pyarrow as pa
 from pyarrow import (
     Array,
@@ -75,6 +78,9 @@ MISSING_STRINGS: set[str] = {
 }
 """Extension of pandas and arrow default missing values."""
 
+CHUNK_ROWS: int = 1 << 20
+"""Size of pieces in which converters process (much) larger columns in parallel."""
+
 
 @contextmanager
 def reset_buffer(buffer):
@@ -84,6 +90,29 @@ def reset_buffer(buffer):
     buffer.seek(cursor)
 
 
+def sample(arr: Array | ChunkedArray, n: int, seed: int | None = 0) -> Array | ChunkedArray:
+    """Stratified random sample of n values (or all values, if there are fewer).
+
+    The array is split into n equally sized ranges (strata), and one value is drawn randomly
+    from each. The sample hence covers the head, middle and tail, as well as all chunks
+    proportionally to their size, while being reproducible given a seed.
+    """
+    size = len(arr)
+    if size <= n:
+        return arr
+
+    rng = np.random.default_rng(seed)
+    step = size / n
+    indices = ((np.arange(n) + rng.random(n)) * step).astype(np.int64)
+    return arr.take(pa.array(np.minimum(indices, size - 1)))
+
+
+def sample_valid(arr: Array | ChunkedArray, n: int, seed: int | None = 0) -> Array | ChunkedArray:
+    """Stratified random sample of n non-null values."""
+    valid = arr.drop_null() if arr.null_count > 0 else arr
+    return sample(valid, n, seed=seed)
+
+
 def smallest_int_type(vmin: Number, vmax: Number) -> str | None:
     """Find the smallest int type able to hold vmin and vmax."""
 
@@ -134,6 +163,37 @@ def proportion_unique(arr: Array) -> float:
     return n_unique / n_valid
 
 
+def map_chunks(
+    func: Callable[..., Array | ChunkedArray],
+    *arrays: Array | ChunkedArray,
+    n_rows: int | None = None,
+) -> Array | ChunkedArray:
+    """Apply an elementwise function to aligned pieces of large arrays in a pool of threads.
+
+    Arrow's compute kernels process a single (chunked) array in a single thread, but release the
+    GIL, so pieces of one huge column can be processed concurrently. Pieces are zero-copy slices of
+    ``n_rows`` rows (default ``CHUNK_ROWS``), and their results are returned as chunks of a single
+    ChunkedArray, without combining them. Smaller arrays are passed to func as they are.
+    """
+    n_rows = n_rows or CHUNK_ROWS
+    n_pieces = -(-len(arrays[0]) // n_rows)
+    if n_pieces <= 1:
+        return func(*arrays)
+
+    def apply(offset: int) -> Array | ChunkedArray:
+        return func(*(arr.slice(offset, n_rows) for arr in arrays))
+
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, n_pieces)) as pool:
+        results = list(pool.map(apply, range(0, len(arrays[0]), n_rows)))
+
+    chunks = [
+        chunk
+        for result in results
+        for chunk in (result.chunks if isinstance(result, ChunkedArray) else [result])
+    ]
+    return pa.chunked_array(chunks, type=results[0].type)
+
+
 def proportion_trueish(arr: Array) -> float:
     if len(arr) == 0:
         # Still means we had no trueish values
@@ -226,6 +286,35 @@ def schema_diff(s1: Schema, s2: Schema) -> dict[str, tuple[DataType, DataType]]:
     return diff
 
 
+def type_from_string(s: str) -> DataType:
+    """Inverse of str(type) for the types produced by lector's converters.
+
+    Supports aliases such as "uint8" or "string", lists, timestamps and dictionaries.
+    """
+    s = s.strip()
+
+    if s.startswith("list<") and s.endswith(">"):
+        inner = s[5:-1]
+        if ":" in inner.split("<")[0]:
+            inner = inner.split(":", 1)[1]
+        return pa.list_(type_from_string(inner))
+
+    if s.startswith("timestamp[") and s.endswith("]"):
+        unit, _, tz = s[10:-1].partition(",")
+        tz = tz.strip().removeprefix("tz=") or None
+        return pa.timestamp(unit.strip(), tz=tz)
+
+    if s.startswith("dictionary<") and s.endswith(">"):
+        params = dict(param.strip().split("=") for param in s[11:-1].split(","))
+        return pa.dictionary(
+            type_from_string(params["indices"]),
+            type_from_string(params["values"]),
+            ordered=params.get("ordered", "0") not in ("0", "False", "false"),
+        )
+
+    return pa.type_for_alias(s)
+
+
 def encode_metadata(d: dict):
     """Json-byte-encode a dict, like Arrow expects its metadata."""
     return {k.encode("utf-8"): json.dumps(v).encode("utf-8") for k, v in d.items()}
@@ -247,32 +336,85 @@ class Timer:
 
 
 if PANDAS_INSTALLED:
-    # Arrow currently doesn't have any way to map its integer types to pandas
-    # extension dtypes depending on whether a columns has missing values or not
+    # Arrow's types_mapper only sees types, not columns, so integer types are mapped to pandas'
+    # nullable extension dtypes if any column of that type has missing values
 
-    @singledispatch
-    def to_pandas(array: Array):
-        """Proper conversion allowing pandas extension types."""
+    def types_mapper(
+        nullable: set[DataType] | None = None,
+        dtype_backend: str = "numpy_nullable",
+    ) -> Callable[[DataType], pd.api.extensions.ExtensionDtype | None]:
+        """Map arrow types to pandas extension dtypes, where necessary or requested.
+
+        Dictionaries are never mapped, so that arrow converts them to ``pd.Categorical``
+        directly (without re-hashing values). With ``dtype_backend="pyarrow"``, all other types
+        are wrapped as ``pd.ArrowDtype``. Otherwise, strings and booleans use pandas' nullable
+        dtypes, as do integer types included in ``nullable``.
+        """
+        nullable = nullable or set()
+
+        def mapper(atype: DataType) -> pd.api.extensions.ExtensionDtype | None:
+            if pat.is_dictionary(atype):
+                return None
+
+            if dtype_backend == "pyarrow":
+                return pd.ArrowDtype(atype)
 
-        atype = array.type
+            if pat.is_string(atype):
+                return pd.StringDtype()
 
-        if pat.is_string(atype):
-            return array.to_pandas().astype("string")
+            if pat.is_boolean(atype):
+                return pd.BooleanDtype()
 
-        if pat.is_boolean(atype):
-            return array.to_pandas().astype("boolean")
+            if pat.is_integer(atype) and atype in nullable:
+                return pd.api.types.pandas_dtype(str(atype).replace("i", "I").replace("u", "U"))
 
-        if pat.is_integer(atype) and array.null_count > 0:
-            dtype_name = str(atype).replace("i", "I").replace("u", "U")
-            return array.to_pandas(integer_object_nulls=True).astype(dtype=dtype_name)
+            return None
 
-        return array.to_pandas()
+        return mapper
+
+    @singledispatch
+    def to_pandas(array: Array | ChunkedArray, dtype_backend: str = "numpy_nullable"):
+        """Proper conversion allowing pandas extension types."""
+        nullable = {array.type} if array.null_count > 0 else set()
+        return array.to_pandas(types_mapper=types_mapper(nullable, dtype_backend))
 
     @to_pandas.register
-    def _(table: Table):
-        columns = [to_pandas(array) for array in table]
-        df = pd.concat(columns, axis=1)
-        df.columns = table.column_names
+    def _(
+        table: Table,
+        dtype_backend: str = "numpy_nullable",
+        split_blocks: bool = False,
+        self_destruct: bool = False,
+    ):
+        """Convert the whole table at once, without intermediate per-column frames.
+
+        ``split_blocks`` and ``self_destruct`` may roughly halve peak memory, but the latter
+        leaves the table unusable (see ``pyarrow.Table.to_pandas()``).
+
+        The types mapper works per type, not per column. Integer columns without nulls, sharing
+        their type with a column having nulls, are therefore cast back to numpy dtypes afterwards.
+        """
+        nullable = {
+            column.type
+            for column in table.columns
+            if pat.is_integer(column.type) and column.null_count > 0
+        }
+        restore = {}
+        if dtype_backend != "pyarrow":
+            restore = {
+                i: column.type.to_pandas_dtype()
+                for i, column in enumerate(table.columns)
+                if column.type in nullable and column.null_count == 0
+            }
+
+        df = table.to_pandas(
+            types_mapper=types_mapper(nullable, dtype_backend),
+            split_blocks=split_blocks,
+            self_destruct=self_destruct,
+        )
+
+        for i, dtype in restore.items():
+            df.isetitem(i, df.iloc[:, i].astype(dtype))
+
         return df
 
 
@@ -0,0 +1,164 @@
+"""Write streams of record batches to Parquet or Arrow IPC (Feather) files.
+
+Batches are written as they arrive, so memory use doesn't depend on the size of the input.
+Field metadata (e.g. semantic types) is preserved in both formats.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from itertools import chain
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pac
+import pyarrow.parquet as pq
+import pyarrow.types as pat
+from pyarrow import Array, DictionaryArray, RecordBatch, Schema, ipc
+
+
+class OutputFormat(str, Enum):
+    Parquet = "parquet"
+    Feather = "feather"
+
+    @classmethod
+    def from_path(cls, path: str | Path) -> OutputFormat:
+        suffix = Path(path).suffix.lower()
+        if suffix in (".parquet", ".pq"):
+            return cls.Parquet
+        if suffix in (".feather", ".arrow", ".ipc"):
+            return cls.Feather
+
+        raise ValueError(f"Cannot infer output format from file extension '{suffix}'!")
+
+
+def decoded_schema(schema: Schema) -> Schema:
+    """Replace dictionary types with the type of their values, keeping field metadata."""
+    return pa.schema(
+        field.with_type(field.type.value_type) if pat.is_dictionary(field.type) else field
+        for field in schema
+    )
+
+
+def decode_dictionaries(batch: RecordBatch) -> RecordBatch:
+    """Replace dictionary-encoded columns with their plain values."""
+    return batch.cast(decoded_schema(batch.schema))
+
+
+class DictionaryUnifier:
+    """Remaps dictionary columns of consecutive batches to growing, shared dictionaries.
+
+    The Arrow IPC file format doesn't allow dictionaries to be replaced between batches. But if
+    each batch's dictionary only extends the previous one, it can be written as a delta.
+    """
+
+    def __init__(self):
+        self.dictionaries: dict[str, Array] = {}
+
+    def unify_array(self, name: str, array: DictionaryArray) -> DictionaryArray:
+        values = array.dictionary
+        known = self.dictionaries.get(name)
+
+        if known is None:
+            self.dictionaries[name] = values
+            return array
+
+        missing = values.filter(pac.is_null(pac.index_in(values, value_set=known)))
+        if len(missing) > 0:
+            known = pa.concat_arrays([known, missing])
+            self.dictionaries[name] = known
+
+        mapping = pac.index_in(values, value_set=known).cast(array.indices.type)
+        indices = mapping.take(array.indices)
+        return pa.DictionaryArray.from_arrays(indices, known)
+
+    def unify(self, batch: RecordBatch) -> RecordBatch:
+        arrays = [
+            self.unify_array(field.name, array) if pat.is_dictionary(field.type) else array
+            for field, array in zip(batch.schema, batch.columns)
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=batch.schema)
+
+
+def regroup(batches: Iterable[RecordBatch], n_rows: int) -> Iterator[pa.Table]:
+    """Collect consecutive batches into tables of at least n_rows (except the last)."""
+    group, size = [], 0
+    for batch in batches:
+        group.append(batch)
+        size += batch.num_rows
+        if size >= n_rows:
+            yield pa.Table.from_batches(group)
+            group, size = [], 0
+
+    if group:
+        yield pa.Table.from_batches(group)
+
+
+def write_parquet(
+    batches: Iterable[RecordBatch],
+    path: str | Path,
+    schema: Schema,
+    row_group_size: int = 1 << 20,
+    compression: str | None = "zstd",
+) -> int:
+    """Write batches to a Parquet file in row groups of approx. row_group_size rows."""
+    n_rows = 0
+    with pq.ParquetWriter(str(path), schema, compression=compression or "none") as writer:
+        for table in regroup(batches, row_group_size):
+            writer.write_table(table, row_group_size=row_group_size)
+            n_rows += table.num_rows
+
+    return n_rows
+
+
+def write_feather(
+    batches: Iterable[RecordBatch],
+    path: str | Path,
+    schema: Schema,
+    compression: str | None = "zstd",
+) -> int:
+    """Write batches to an Arrow IPC (Feather v2) file, unifying dictionaries across batches."""
+    if compression is not None and compression.lower() in ("", "none"):
+        compression = None
+
+    options = ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+    unifier = DictionaryUnifier()
+    n_rows = 0
+    with ipc.new_file(str(path), schema, options=options) as writer:
+        for batch in batches:
+            writer.write_batch(unifier.unify(batch))
+            n_rows += batch.num_rows
+
+    return n_rows
+
+
+def write_batches(
+    batches: Iterable[RecordBatch],
+    path: str | Path,
+    format: OutputFormat | None = None,
+    row_group_size: int = 1 << 20,
+    compression: str | None = "zstd",
+    dictionaries: bool = True,
+) -> int:
+    """Write a stream of batches sharing a schema, returning the number of rows written.
+
+    If ``dictionaries`` is False, dictionary-encoded (categorical) columns are stored as plain
+    values. The row group size only applies to Parquet files.
+    """
+    batches = iter(batches)
+    first = next(batches, None)
+    if first is None:
+        raise ValueError("Cannot write an empty stream of batches!")
+
+    format = OutputFormat(format) if format is not None else OutputFormat.from_path(path)
+    schema = first.schema
+    batches = chain([first], batches)
+
+    if not dictionaries:
+        schema = decoded_schema(schema)
+        batches = map(decode_dictionaries, batches)
+
+    if format == OutputFormat.Parquet:
+        return write_parquet(batches, path, schema, row_group_size, compression)
+
+    return write_feather(batches, path, schema, compression)
@@ -1,4 +1,5 @@
 """Test detection of dialects of otherwise valid CSV files."""
+import csv
 import io
 from csv import QUOTE_MINIMAL, get_dialect
 
@@ -7,7 +8,8 @@ from hypothesis import given
 from hypothesis.strategies import data
 from hypothesis_csv.strategies import csv as csv_strat
 
-from lector.csv.dialects import Dialect, PySniffer
+import lector
+from lector.csv.dialects import DELIMITER_OPTIONS, Dialect, FastSniffer, PySniffer
 
 from .utils import equal
 
@@ -52,3 +54,33 @@ def test_dialects(dialect, data):
     expected = fix_expected_dialect(expected)
     detected = PySniffer().detect(io.StringIO(csv))
     assert equal(expected, detected)
+
+
+@pytest.mark.parametrize("delimiter", DELIMITER_OPTIONS)
+def test_fast_sniffer(delimiter):
+    """Delimiters inside quoted fields, incl. across lines, don't confuse the field counts."""
+    values = ["a", "b,c", "d;e", "f\tg", "h|i", 'j"k', "l\nm", "1.5", ""]
+    rows = [[values[(i + j) % len(values)] for j in range(5)] for i in range(1000)]
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=delimiter).writerows(rows)
+
+    detector = FastSniffer(fallback=False, n_chars=(1 << 10, 1 << 14))
+    assert detector.detect(io.StringIO(buffer.getvalue())) == Dialect(delimiter=delimiter)
+
+    # With no time budget, returns the best candidate from the first sample
+    detector = FastSniffer(fallback=False, max_seconds=0.0, min_consistency=1.01)
+    assert detector.detect(io.StringIO(buffer.getvalue())) == Dialect(delimiter=delimiter)
+
+
+def test_fast_sniffer_apostrophe():
+    """A stray apostrophe isn't mistaken for the quote char, which would swallow the file."""
+    csv = "name,comment,score\nalice,'90s music,1\nbob,ok,2\ncarol,rock,3\ndave,x,4\n"
+    assert FastSniffer().detect(io.StringIO(csv)) == Dialect(delimiter=",", quote_char='"')
+
+    tbl = lector.read_csv(io.BytesIO(csv.encode("utf-8")))
+    assert tbl.num_rows == csv.count("\n") - 1
+    assert tbl.column("comment").to_pylist() == ["'90s music", "ok", "rock", "x"]
+
+    # Single quotes are used if they do enclose fields
+    csv = "a,b\n'x,y',1\n'z',2\n"
+    assert FastSniffer(fallback=False).detect(io.StringIO(csv)).quote_char == "'"
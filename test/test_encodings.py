@@ -83,3 +83,19 @@ def test_roundtrips(example):
 
     assert codecs_equal(codec, detected)
     assert decoded.count(CODEC_ERR) == 0
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_incremental_detection(chunk_size):
+    """Detection doesn't depend on the chunks multi-byte characters may be split across."""
+    text = "première ünïcode 刺靑 𐐀 " * 100
+    detector = Chardet(chunk_size=chunk_size)
+    assert detector.detect(io.BytesIO(text.encode("utf-8"))) == "utf-8"
+
+    encoded = text.encode("utf-8")[:-2]
+    assert Chardet(chunk_size=chunk_size, n_bytes_utf8=len(encoded)).is_utf8(io.BytesIO(encoded))
+
+    latin = ("première is first " * 100).encode("ISO-8859-1")
+    buffer = io.BytesIO(latin)
+    assert not Chardet(chunk_size=chunk_size, n_bytes_utf8=len(latin) // 2).is_utf8(buffer)
+    assert buffer.tell() < len(latin)
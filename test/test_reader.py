@@ -1,16 +1,28 @@
 """Test CSV readers."""
+import bz2
 import csv
+import gzip
 import io
+import lzma
 import sys
 from csv import get_dialect
 
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import pyarrow.types as pat
 import pytest
 from hypothesis import given
 from hypothesis.strategies import data
 from hypothesis_csv.strategies import csv as csv_strat
+from pyarrow import feather
+from typer.testing import CliRunner
 
 import lector
-from lector.csv import ArrowReader, Dialect, EmptyFileError
+from lector.cli import CLI
+from lector.csv import ArrowReader, Dialect, EmptyFileError, Preambles, compression
+from lector.csv.dialects import FastSniffer
+from lector.writers import write_batches
 
 from .test_dialects import fix_expected_dialect
 from .test_encodings import CODECS, codecs_compatible
@@ -117,3 +129,389 @@ def test_all(codec, preamble, dialect, data):
         print(f"FAILED ON CSV:\n{csv}")
         sys.exit()
         raise
+
+
+def test_stream():
+    """Streamed batches share a single schema inferred from the first batch."""
+    rows = [f'{i},cat{i % 3},2022-06-{i % 28 + 1:02d},"[{i % 5}, {i}]"' for i in range(10_000)]
+    csv = "num,cat,date,list\n" + "\n".join(rows)
+
+    fp = io.BytesIO(csv.encode("utf-8"))
+    batches = list(lector.read_csv(fp, stream=True, block_size=1 << 14))
+    assert len(batches) > 1
+    assert all(batch.schema == batches[0].schema for batch in batches)
+
+    tbl = pa.Table.from_batches(batches)
+    assert tbl.num_rows == len(rows)
+    assert tbl.schema.field("num").type == pa.uint64()
+    assert tbl.schema.field("list").type == pa.list_(pa.uint64())
+    assert pat.is_timestamp(tbl.schema.field("date").type)
+    assert pat.is_dictionary(tbl.schema.field("cat").type)
+    assert tbl.column("num").to_pylist() == list(range(10_000))
+
+
+def test_stream_replays_plan():
+    """Later batches are converted with the parameters inferred from the first batch."""
+    march = 3
+    text = "some longer sentence of free text number"
+    first = [f"0{march}/{13 + i % 15:02d}/2022,{i % 200},{text} {i}" for i in range(5000)]
+    later = [f"0{march}/{1 + i % 12:02d}/2022,{i % 200}.5,same" for i in range(3000)]
+    csv = ("d,n,t\n" + "\n".join(first + later) + "\n").encode("utf-8")
+
+    # Floats don't fit the integer type inferred from the first batch
+    with pytest.raises(ValueError, match="Column 'n'"):
+        list(lector.read_csv(io.BytesIO(csv), stream=True, block_size=1 << 14))
+
+    strategy = lector.Autocast(coerce=True)
+    batches = lector.read_csv(io.BytesIO(csv), stream=True, block_size=1 << 14, strategy=strategy)
+    batches = list(batches)
+    assert len(batches) > 1
+    tbl = pa.Table.from_batches(batches)
+
+    # The last batch alone would rank day-first formats higher
+    expected = lector.read_csv(io.BytesIO(csv)).column("d")
+    assert tbl.column("d").to_pylist() == expected.to_pylist()
+    assert tbl.column("d")[-1].as_py().month == march
+
+    # With coerce=True, the floats become nulls
+    assert tbl.schema.field("n").type == pa.uint64()
+    assert tbl.column("n").null_count == len(later)
+
+    # The text converter declines batches of a single repeated value, which are kept as is
+    assert strategy.plan.columns["t"].converter == "text"
+    assert tbl.column("t").to_pylist()[-len(later) :] == ["same"] * len(later)
+
+
+def test_invalid_utf8(tmp_path):
+    """Sporadic invalid bytes in utf-8 files are replaced when falling back to transcoding."""
+    rows = [f"{i},text{i}" for i in range(5_000)]
+    data = ("a,b\n" + "\n".join(rows)).encode("utf-8").replace(b"text42\n", b"te\xfft42\n")
+
+    path = tmp_path / "invalid.csv"
+    path.write_bytes(data)
+
+    for source in (lambda: io.BytesIO(data), lambda: path):
+        reader = ArrowReader(source(), log=False)
+        tbl = reader.read(types="string")
+        assert reader.format.encoding == "utf-8"
+        assert tbl.num_rows == len(rows)
+        assert tbl.column("b")[42].as_py() == "te�t42"
+
+        # Arrow's own type inference would silently produce a binary column
+        tbl = ArrowReader(source(), log=False).read(types=None)
+        assert tbl.schema.field("b").type == pa.string()
+        assert tbl.column("b")[42].as_py() == "te�t42"
+
+        batches = list(ArrowReader(source(), log=False).iter_batches(types=None))
+        assert all(batch.schema.field("b").type == pa.string() for batch in batches)
+
+
+@pytest.mark.parametrize("codec", ["utf-8", "windows-1252"])
+def test_inputs(codec, tmp_path):
+    """In-memory bytes, Arrow buffers and memory-mapped files are read without copies."""
+    csv = "a,b\n1,première\n2,deuxième\n"
+    data = csv.encode(codec)
+    path = tmp_path / "inputs.csv"
+    path.write_bytes(data)
+
+    expected = lector.read_csv(io.BytesIO(data), types="string")
+    inputs = [data, bytearray(data), memoryview(data), pa.py_buffer(data), pa.BufferReader(data)]
+
+    for fp in inputs:
+        assert lector.read_csv(fp, types="string").equals(expected)
+
+    assert lector.read_csv(path, types="string", memory_map=True).equals(expected)
+    assert lector.read_csv(str(path), types="string", memory_map=True).equals(expected)
+
+
+def test_native_files(tmp_path):
+    """Local files re-opened natively are closed after reading, and nameless buffers work."""
+    path = tmp_path / "native.csv"
+    path.write_bytes(b"a,b\n1,2\n")
+
+    with open(path, "rb") as fp:
+        reader = ArrowReader(fp, log=False)
+        reader.analyze()
+        with reader.opened() as stream:
+            assert isinstance(stream, pa.OSFile)
+        assert stream.closed
+
+    nameless = io.BufferedReader(io.BytesIO(path.read_bytes()))
+    assert lector.read_csv(nameless, log=False).column("b").to_pylist() == [2]
+
+
+def test_format_cache(tmp_path):
+    """Detected formats are cached by fingerprint, and can be serialized and passed explicitly."""
+    path = tmp_path / "cached.csv"
+    path.write_bytes(b"Preamble line\n\na;b\n1;2\n3;4\n")
+    cache = lector.FormatCache(tmp_path / "cache", max_entries=1)
+
+    reader = ArrowReader(path, cache=cache, log=False)
+    expected = reader.read()
+    assert len(cache) == 1
+    assert cache.get(cache.fingerprint(path)) == reader.format
+
+    # Cache hits skip all detectors
+    cached = ArrowReader(path, encoding=None, dialect=None, cache=cache, log=False)
+    cached.encoding.detect = cached.dialect.detect = None
+    assert cached.read().equals(expected)
+
+    fmt = lector.Format.from_json(reader.format.to_json())
+    assert fmt == reader.format
+    assert lector.read_csv(io.BytesIO(path.read_bytes()), format=fmt).equals(lector.read_csv(path))
+
+    other = tmp_path / "other.csv"
+    other.write_bytes(b"x,y\n1,2\n")
+    lector.read_csv(other, cache=cache)
+    assert len(cache) == 1
+    assert cache.invalidate(other)
+    assert not cache.invalidate(path)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_read_many(tmp_path, n_jobs):
+    """Schemas of multiple files are unified, and errors collected."""
+    csvs = {
+        "a.csv": "num,cat\n1,x\n2,y\n",
+        "b.csv": "num,cat,extra\n-1000,z,\n2,x,\n",
+        "empty.csv": "",
+    }
+    paths = []
+    for name, text in csvs.items():
+        path = tmp_path / name
+        path.write_text(text)
+        paths.append(path)
+
+    result = lector.read_many(paths, n_jobs=n_jobs)
+    assert list(result.tables) == [str(path) for path in paths[:2]]
+    assert isinstance(result.errors[str(paths[2])], EmptyFileError)
+
+    tbl = result.table
+    assert tbl.column_names == ["num", "cat", "extra"]
+    assert tbl.column("num").type == pa.int16()
+    assert tbl.column("num").to_pylist() == [1, 2, -1000, 2]
+    assert tbl.column("cat").chunk(0).dictionary.to_pylist() == ["x", "y", "z"]
+    assert tbl.column("extra").to_pylist() == [None] * 4
+
+    with pytest.raises(ValueError, match="profile"):
+        lector.read_many(paths, n_jobs=n_jobs, profile=True)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_write_batches(tmp_path, suffix):
+    """Streamed batches are written with their types, metadata and (merged) dictionaries."""
+    n_rows = 10_000
+    rows = [f"{i},cat{i % 7 if i < n_rows // 2 else i % 11}" for i in range(n_rows)]
+    csv = ("num,cat\n" + "\n".join(rows)).encode("utf-8")
+    batches = lector.read_csv(io.BytesIO(csv), stream=True, block_size=1 << 12)
+
+    path = tmp_path / f"out{suffix}"
+    assert write_batches(batches, path) == n_rows
+
+    tbl = pq.read_table(path) if suffix == ".parquet" else feather.read_table(path)
+    expected = lector.read_csv(io.BytesIO(csv))
+    assert tbl.column_names == expected.column_names
+    assert tbl.column("num").to_pylist() == expected.column("num").to_pylist()
+    assert tbl.column("cat").to_pylist() == expected.column("cat").to_pylist()
+    assert pat.is_dictionary(tbl.schema.field("cat").type)
+    assert tbl.schema.field("cat").metadata == expected.schema.field("cat").metadata
+
+
+def test_convert_uncompressed(tmp_path):
+    """The CLI converts to uncompressed Feather files with ``--compression none``."""
+    fp = tmp_path / "in.csv"
+    fp.write_text("num,cat\n1,a\n2,b\n")
+    out = tmp_path / "out.feather"
+
+    result = CliRunner().invoke(CLI, ["convert", str(fp), str(out), "--compression", "none"])
+    assert result.exit_code == 0, result.output
+    assert feather.read_table(out).column("num").to_pylist() == [1, 2]
+
+
+def test_profile():
+    """Profiles record detection steps, the parse and every conversion attempt."""
+    n_rows = 1000
+    csv = ("num,cat\n" + "\n".join(f"{i},cat{i % 3}" for i in range(n_rows))).encode("utf-8")
+    tbl, profile = lector.read_csv(io.BytesIO(csv), profile=True)
+    assert tbl.num_rows == n_rows
+
+    names = [span.name for span in profile.spans]
+    for step in ("encoding", "decode", "preamble", "dialect", "columns", "parse"):
+        assert step in names
+
+    parse = profile.find("parse")[0]
+    assert parse.bytes == len(csv)
+    assert parse.meta["rows"] == n_rows
+
+    attempts = [span for span in profile.find("convert/") if span.meta["column"] == "cat"]
+    assert any(not span.meta["accepted"] for span in attempts)
+    assert attempts[-1].name == "convert/category"
+    assert attempts[-1].meta == {"column": "cat", "stage": "full", "accepted": True}
+    assert profile.total() > 0
+
+
+def test_columns():
+    """Columns are selected by clean name or index, in the requested order."""
+    csv = b"Some preamble\n a ,,a,b\n1,2,3,4\n5,6,7,8\n"
+    tbl = lector.read_csv(io.BytesIO(csv), columns=["b", 0, "Unnamed_0", -2])
+    assert tbl.column_names == ["b", "a", "Unnamed_0", "a_1"]
+    assert tbl.column("a_1").to_pylist() == [3, 7]
+
+    batches = lector.read_csv(io.BytesIO(csv), columns=[1], stream=True)
+    assert pa.Table.from_batches(batches).column_names == ["Unnamed_0"]
+
+    with pytest.raises(ValueError, match="not found"):
+        lector.read_csv(io.BytesIO(csv), columns=["c"])
+
+
+def test_nrows():
+    """Only the requested number of rows is read, across batch boundaries."""
+    n_rows = 10_000
+    csv = "a,b\n" + "".join(f"{i},x{i}\n" for i in range(n_rows))
+    for nrows in (0, 3, 5_000, 20_000):
+        tbl = lector.read_csv(io.BytesIO(csv.encode()), nrows=nrows, block_size=1 << 12)
+        assert tbl.num_rows == min(nrows, n_rows)
+        assert tbl.column_names == ["a", "b"]
+
+    tbl = lector.read_csv(io.BytesIO(csv.encode()), nrows=3)
+    assert tbl.column("a").to_pylist() == [0, 1, 2]
+    assert pat.is_integer(tbl.schema.field("a").type)
+
+    nrows = 1234
+    fp = io.BytesIO(csv.encode())
+    batches = lector.read_csv(fp, nrows=nrows, stream=True, block_size=1 << 12)
+    assert pa.Table.from_batches(batches).num_rows == nrows
+
+
+@pytest.mark.parametrize("codec", ["gzip", "bz2", "xz", "zstd"])
+def test_compressed(codec, tmp_path):
+    """Compressed inputs are detected from magic bytes and decompressed while parsing."""
+    n_rows, nrows = 10_000, 10
+    csv = "Some preamble\n\nid;name\n" + "".join(f"{i};näme {i % 7}\n" for i in range(n_rows))
+    compress = {
+        "gzip": gzip.compress,
+        "bz2": bz2.compress,
+        "xz": lzma.compress,
+        "zstd": lambda data: pa.compress(data, codec="zstd", asbytes=True),
+    }
+    data = compress[codec](csv.encode("latin-1"))
+
+    path = tmp_path / f"data.csv.{codec}"
+    path.write_bytes(data)
+
+    for src in (path, io.BytesIO(data), data):
+        tbl = lector.read_csv(src)
+        assert tbl.num_rows == n_rows
+        assert tbl.column_names == ["id", "name"]
+        assert tbl.column("name")[1].as_py() == "näme 1"
+
+    assert lector.read_csv(path, nrows=nrows).num_rows == nrows
+    batches = lector.read_csv(path, stream=True, block_size=1 << 14)
+    assert sum(batch.num_rows for batch in batches) == n_rows
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "python"])
+def test_pandas_reader(engine):
+    """Both engines agree, in one go or in chunks of exactly chunksize rows."""
+    pytest.importorskip("pandas")
+    from lector.csv.pandas import PandasReader
+
+    csv = "Some preamble\n\nid;name;text\n"
+    n_rows = 1000
+    csv += "".join(f'{i};n{i};"multi\nline {i}"\n' for i in range(n_rows))
+
+    df = PandasReader(io.BytesIO(csv.encode()), log=False).read(engine=engine)
+    assert df.shape == (n_rows, 3)
+    assert df["text"].iloc[3] == "multi\nline 3"
+
+    reader = PandasReader(io.BytesIO(csv.encode()), log=False)
+    chunks = list(reader.read(engine=engine, chunksize=300, block_size=1 << 12))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    assert chunks[-1]["id"].iloc[-1] == n_rows - 1
+
+    # The Arrow engine shares the analysis, without reading the sample again or closing the buffer
+    fp = CountingBytesIO(csv.encode())
+    reader = PandasReader(fp, log=False)
+    reader.analyze()
+    n_read = fp.n_read
+    tbl = reader.arrow_reader().read()
+    assert tbl.num_rows == n_rows
+    assert fp.n_read == n_read
+    assert not fp.closed
+
+
+def test_invalid_rows(tmp_path):
+    """Invalid rows can be skipped, quarantined, padded/truncated, or raise."""
+    n_rows, n_invalid = 30, 10
+    csv = "a,b,c\n" + "".join(
+        f"{i},x{i},{i / 2}\n" if i % 3 else (f"{i},short\n" if i % 2 else f"{i},y,1.5,extra\n")
+        for i in range(n_rows)
+    )
+
+    reader = ArrowReader(io.BytesIO(csv.encode()), log=False)
+    assert reader.read().num_rows == n_rows - n_invalid
+    assert reader.n_skipped == n_invalid
+    assert reader.skip_rate == pytest.approx(1 / 3)
+
+    path = tmp_path / "quarantine.csv"
+    reader = ArrowReader(
+        io.BytesIO(csv.encode()), invalid_rows="quarantine", quarantine=path, log=False
+    )
+    assert reader.read().num_rows == n_rows - n_invalid
+    quarantined = reader.quarantined()
+    assert quarantined.column("text").to_pylist()[:2] == ["0,y,1.5,extra", "3,short"]
+    assert quarantined.column("actual_columns").to_pylist()[:2] == [4, 2]
+    assert pacsv.read_csv(path).num_rows == n_invalid
+
+    tbl = lector.read_csv(io.BytesIO(csv.encode()), invalid_rows="pad")
+    assert tbl.num_rows == n_rows
+    assert tbl.slice(n_rows - n_invalid, 2).to_pylist() == [
+        {"a": 0, "b": "y", "c": 1.5},
+        {"a": 3, "b": "short", "c": None},
+    ]
+
+    with pytest.raises(pa.ArrowInvalid, match="Expected 3 columns"):
+        lector.read_csv(io.BytesIO(csv.encode()), invalid_rows="error")
+
+
+class CountingBytesIO(io.BytesIO):
+    """Counts the bytes read from the buffer."""
+
+    n_read = 0
+
+    def read(self, *args):
+        data = super().read(*args)
+        self.n_read += len(data)
+        return data
+
+
+def test_shared_sample(monkeypatch):
+    """Detection reads a bounded head sample once, and detectors agree on it and on buffers."""
+    monkeypatch.setattr("lector.csv.abc.SAMPLE_BYTES", 1 << 12)
+    preamble = "Report\nGenerated today\n,,,\n"
+    n_preamble, n_rows = 3, 10_000
+    csv = preamble + "a;b;c\n" + "".join(f"{i};x{i};\x00y\n" for i in range(n_rows))
+
+    fp = CountingBytesIO(csv.encode("utf-8"))
+    reader = ArrowReader(fp, log=False)
+    reader.analyze()
+    # Only the magic bytes (compression) and the sample (plus one byte) are read
+    assert fp.n_read <= (1 << 12) + 1 + compression.N_MAGIC
+    assert not reader.sample.complete
+    assert reader.format.preamble == n_preamble
+    assert reader.format.dialect.delimiter == ";"
+    assert reader.format.columns == ["a", "b", "c"]
+
+    sample = reader.sample.skip(n_preamble)
+    assert sample.lines[0] == "a;b;c\n"
+    assert all(line.endswith("\n") and "\x00" not in line for line in sample.lines)
+
+    text = io.StringIO(csv)
+    assert Preambles.detect(text) == Preambles.detect(reader.sample) == n_preamble
+    for _ in range(n_preamble):
+        text.readline()
+    assert FastSniffer().detect(text) == FastSniffer().detect(sample)
+
+    tbl = reader.parse()
+    assert tbl.num_rows == n_rows
+    assert tbl.column_names == ["a", "b", "c"]
@@ -3,9 +3,16 @@ from collections import namedtuple
 
 import pyarrow as pa
 import pyarrow.types as pat
+import pytest
 
 import lector
-from lector import ArrowReader, Autocast
+from lector import ArrowReader, Autocast, Cast, CastPlan
+from lector.types import Category, Number, Timestamp
+from lector.types.cast import UniqueValues, widen_type
+from lector.types.lists import parse_lists
+from lector.types.numbers import decimal_delimiter, decimal_delimiters
+from lector.types.timestamps import rank_formats
+from lector.utils import sample, sample_valid
 
 from .utils import equal
 
@@ -162,3 +169,200 @@ def test_inference():
 
     for name, type in LECTOR_TYPES.items():
         assert equal(type, schema.field(name).type, extra=name)
+
+
+def test_parallel_cast():
+    """Casting columns in a thread pool produces the same table as casting serially."""
+    tbl = ArrowReader(io.BytesIO(TYPE_CSV.encode("utf-8")), log=False).read(types="string")
+    serial = Autocast(log=False).cast(tbl)
+    parallel = Autocast(log=False, n_jobs=4).cast(tbl)
+    assert parallel.equals(serial, check_metadata=True)
+
+    converters = {"num_int8": Number(), "date_custom": Timestamp(), "cat": Category()}
+    serial = Cast(converters).cast(tbl)
+    parallel = Cast(converters, n_jobs=-1).cast(tbl)
+    assert parallel.equals(serial, check_metadata=True)
+    assert parallel.column_names == tbl.column_names
+
+
+def test_cast_plan():
+    """A serialized cast plan replays the autocast without inference."""
+    tbl = ArrowReader(io.BytesIO(TYPE_CSV.encode("utf-8")), log=False).read(types="string")
+    strategy = Autocast(log=False)
+    expected = strategy.cast(tbl)
+
+    plan = CastPlan.from_json(strategy.plan.to_json())
+    assert list(plan.columns) == tbl.column_names
+    assert plan.columns["date_custom"].converter == "timestamp"
+
+    replayed = plan.to_cast().cast(tbl)
+    assert replayed.equals(expected, check_metadata=True)
+
+    for name, type in plan.column_types().items():
+        assert widen_type(expected.schema.field(name).type) == type
+
+
+def test_cast_plan_column_types():
+    """Only columns Arrow can parse without loss are native, with integers widened."""
+    n, junk = 100, 50
+    csv = "clean,junk,signed\n" + "".join(
+        f"{i},{'abc' if i == junk else i},{'+' if i % 2 else ''}{i}\n" for i in range(n)
+    )
+    fp = lambda: io.BytesIO(csv.encode("utf-8"))
+
+    strategy = Autocast(log=False)
+    tbl = lector.read_csv(fp(), strategy=strategy)
+    assert tbl.schema.field("junk").type == pa.uint8()
+    plan = strategy.plan
+
+    types = plan.column_types()
+    assert types == {"clean": pa.uint64()}
+
+    native = lector.read_csv(fp(), types=types, log=False)
+    rest = plan.to_cast(exclude=types).cast(native)
+    assert rest.column("junk").null_count == 1
+    assert rest.column("signed").to_pylist() == list(range(n))
+
+    # Replaying on larger values keeps the (wider) converted type rather than failing
+    larger = lector.read_csv(io.BytesIO(b"clean,junk,signed\n1000,1000,+1000\n"), types="string")
+    replayed = plan.to_cast().cast(larger)
+    assert replayed.column("junk").to_pylist() == [1000]
+
+
+def test_cast_plan_lists():
+    """List plans record the widened element type, and unfit lists are kept unconverted."""
+    tbl = pa.table({"l": pa.array(["[1,2]", "[3,4]"] * 50)})
+    strategy = Autocast(log=False)
+    assert strategy.cast(tbl).schema.field("l").type == pa.list_(pa.uint8())
+    cast = strategy.plan.to_cast()
+
+    larger = pa.table({"l": pa.array(["[1000,2]", "[-3,4]"])})
+    assert cast.cast(larger).column("l").to_pylist() == [[1000, 2], [-3, 4]]
+
+    floats = pa.table({"l": pa.array(["[1.5,2]", "[3,4]"])})
+    assert cast.cast(floats).column("l").type == pa.string()
+
+
+DECIMAL_STRINGS = [
+    *["1,234.0", "1.234,0", "1,234,456", "1.234.456", "1,234,456.987", "1.234.456,987"],
+    *["0.1", "0,1", ".1", ",1", "98765.123", "98765,123", "123", "", "1.2.3,4", "abc"],
+    *["12345678901234567890123.5", "1234567890123.5", "-1,5", "+1.500", "1e10", "1.03481E-11"],
+]
+
+
+@pytest.mark.parametrize("string", DECIMAL_STRINGS)
+def test_decimal_delimiters(string):
+    """The vectorized delimiter inference agrees with the scalar version."""
+    assert decimal_delimiters(pa.array([string]))[0].as_py() == decimal_delimiter(string)
+
+
+def test_parse_lists():
+    """Simple lists are split natively, while quoted or nested lists are parsed row by row."""
+    chunks = [
+        ["[a, b]", '["x, y", "z"]', None],
+        ["[]", "['q', 'r']", "|f|", "[[1,2],[3]]"],
+    ]
+    result = parse_lists(pa.chunked_array(chunks))
+    expected = [["a", "b"], ["x, y", "z"], None, [], ["q", "r"], ["f"], ["[1, 2]", "[3]"]]
+    assert result.to_pylist() == expected
+
+
+def test_rank_formats():
+    """Timestamp formats are ranked by the proportion of sampled values they can parse."""
+    dates = pa.array(["01/02/2022"] + ["12/31/2022"] * 99 + [None])
+    assert rank_formats(dates) == [("%m/%d/%Y", 1.0)]
+
+    dates = pa.array(["2022-12-31"] * 9 + ["31/12/2022"])
+    ranked = rank_formats(dates)
+    assert ranked[0] == ("%Y-%m-%d", 0.9)
+    assert ("%d/%m/%Y", 0.1) in ranked
+
+
+def test_sample():
+    """Samples are stratified across chunks and positions, and reproducible given a seed."""
+    arr = pa.chunked_array([list(range(i * 1000, (i + 1) * 1000)) for i in range(10)])
+    sampled = sample(arr, 100, seed=42).to_pylist()
+    assert sampled == sample(arr, 100, seed=42).to_pylist()
+    assert sampled != sample(arr, 100, seed=1).to_pylist()
+    assert all(i * 100 <= value < (i + 1) * 100 for i, value in enumerate(sampled))
+
+    arr = pa.array([None, 1, None, 2, 3])
+    assert sample_valid(arr, 10).to_pylist() == [1, 2, 3]
+
+
+def test_to_pandas():
+    """Nullable dtypes only where needed, categoricals kept, or all pyarrow-backed."""
+    pd = pytest.importorskip("pandas")
+    from lector.utils import to_pandas
+
+    tbl = pa.table(
+        {
+            "int": pa.array([1, 2, 3], pa.int16()),
+            "int_null": pa.array([1, None, 3], pa.uint8()),
+            "str": ["a", None, "c"],
+            "cat": pa.array(["x", "y", "x"]).dictionary_encode(),
+        }
+    )
+    df = to_pandas(tbl)
+    assert df.dtypes.astype(str).tolist() == ["int16", "UInt8", "string", "category"]
+    assert df["int_null"].isna().tolist() == [False, True, False]
+    assert df["cat"].cat.categories.tolist() == ["x", "y"]
+
+    df = to_pandas(tbl, dtype_backend="pyarrow", split_blocks=True, self_destruct=True)
+    assert isinstance(df["int"].dtype, pd.ArrowDtype)
+    assert isinstance(df["cat"].dtype, pd.CategoricalDtype)
+
+    assert str(to_pandas(pa.array([1, None], pa.int8())).dtype) == "Int8"
+
+    # Nullable dtypes are decided per column, also if columns share a type
+    tbl = pa.table({"a": pa.array([1, 2], pa.int16()), "b": pa.array([1, None], pa.int16())})
+    assert to_pandas(tbl).dtypes.astype(str).tolist() == ["int16", "Int16"]
+
+
+def test_unique_first():
+    """Converting distinct values only gives same results, with thresholds weighted by counts."""
+    values = ["2021-01-01", "2021-02-03", None, "2022-12-31"] * 1000
+    tbl = pa.table({"date": values, "num": ["1,5", "2", "3,25", None] * 1000})
+    expected = Autocast().cast(tbl)
+    result = Autocast(max_unique=0.1).cast(tbl)
+    assert result.equals(expected)
+    assert pat.is_timestamp(result.schema.field("date").type)
+
+    # 2 of 3 distinct values but only 10% of rows are numbers
+    arr = pa.array(["1"] * 5 + ["2"] * 5 + ["x"] * 90)
+    converters = [Number(threshold=0.5)]
+    assert Autocast(converters, fallback=None, max_unique=0.5).cast(arr) is None
+
+    # 1 of 2 distinct values, but 99% of rows are numbers
+    arr = pa.array(["1"] * 99 + ["x"])
+    conv = Autocast([Number(threshold=0.9)], fallback=None, max_unique=0.5).cast(arr)
+    assert conv.result.null_count == 1
+
+    # The decimal delimiter of frequent values outweighs that of more, but rare, distinct values
+    arr = pa.array(["1,5"] * 1000 + ["2.5", "3.5", "4.5"])
+    conv = Autocast([Number()], fallback=None, max_unique=0.5).cast(arr)
+    assert conv.result.to_pylist()[:2] == [1.5, 1.5]
+    assert conv.params["decimal"] == ","
+
+    # Row indices are only calculated to expand accepted conversions
+    unique = UniqueValues.from_array(pa.array(["a", "b", None, "a"]))
+    assert "indices" not in unique.__dict__
+    assert unique.expand(pa.array([1, 2])).to_pylist() == [1, 2, None, 1]
+
+
+def test_chunked_conversion(monkeypatch):
+    """Converting large columns in pieces gives same results, and keeps them chunked."""
+    values = {
+        "int": ["1", "+2", None, "-3"],
+        "float": ["1,5", "1.000,25", "", "-3,0"],
+        "date": ["2021-01-01", "2021-02-03", None, "2022-12-31"],
+        "date_frac": ["01/02/2021 10:11:12.123", "03/02/2021 10:11:12.5", None, None],
+        "url": ["http://a.com", "https://b.org/x", None, "www.c.de"],
+    }
+    tbl = pa.table({name: pa.chunked_array([vals * 10, vals * 5]) for name, vals in values.items()})
+    expected = Autocast().cast(tbl)
+
+    monkeypatch.setattr(lector.utils, "CHUNK_ROWS", 7)
+    result = Autocast().cast(tbl)
+    assert result.equals(expected)
+    assert result.column("date").num_chunks > tbl.column("date").num_chunks